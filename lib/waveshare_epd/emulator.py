@@ -0,0 +1,183 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from . import packing
+from .mock import EPD_HEIGHT, EPD_PALETTE, EPD_WIDTH
+
+# Timing model of the 7.3" panel on a 4 MHz SPI bus, in seconds
+SPI_SPEED_HZ = 4000000
+INIT_TIME = 0.07
+REFRESH_TIME = 12.0
+SLEEP_TIME = 2.0
+
+RING_SIZE = 8
+
+# Panel variants, palettes are in controller index order. The gray levels
+# come from the driver registry, which shares them with the renderer. Only
+# the monochrome waveform has a fast refresh
+MONO_PALETTE = (0, 0, 0, 255, 255, 255)
+MODES = {
+    "color": {
+        "palette": EPD_PALETTE,
+        "bits": 4,
+        "white": 1,
+        "refresh": REFRESH_TIME,
+        "fast": None,
+    },
+    "mono": {
+        "palette": MONO_PALETTE,
+        "bits": 1,
+        "white": 1,
+        "refresh": 1.5,
+        "fast": 0.5,
+    },
+    "gray": {"palette": None, "bits": 2, "white": 3, "refresh": 3.0, "fast": None},
+}
+
+logger = logging.getLogger(__name__)
+
+
+class EPD:
+    def __init__(
+        self, time_scale=None, ring_size=RING_SIZE, mode="color", palette=None
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown emulator mode: {mode}")
+        self.width = EPD_WIDTH
+        self.height = EPD_HEIGHT
+        self.palette = palette or MODES[mode]["palette"]
+        if not self.palette:
+            raise ValueError(f"Emulator mode {mode} needs a palette")
+        self.bits = MODES[mode]["bits"]
+        self.white = MODES[mode]["white"]
+        self.refresh_time = MODES[mode]["refresh"]
+        self.fast_time = MODES[mode]["fast"]
+        self.mode = mode
+        self.packer = packing.PACKERS[self.bits]
+        self.BLACK = 0x000000
+        self.WHITE = 0xFFFFFF
+        self.YELLOW = 0x00FFFF
+        self.RED = 0x0000FF
+        self.BLUE = 0xFF0000
+        self.GREEN = 0x00FF00
+
+        # 1.0 blocks for the modelled time, 0 only accounts for it
+        if time_scale is None:
+            time_scale = float(os.environ.get("EPD_EMULATOR_TIME_SCALE", 1.0))
+        self.time_scale = time_scale
+
+        # Recent framebuffers, newest last, as (timestamp, buffer)
+        self.frames = deque(maxlen=ring_size)
+        self.lock = threading.Lock()
+        self.writer = None
+        self.stats = {
+            "init": 0,
+            "display": 0,
+            "fast": 0,
+            "sleep": 0,
+            "bytes": 0,
+            "spi_seconds": 0.0,
+            "busy_seconds": 0.0,
+        }
+
+    def _busy(self, seconds):
+        with self.lock:
+            self.stats["busy_seconds"] += seconds
+        if self.time_scale > 0:
+            time.sleep(seconds * self.time_scale)
+
+    def _transfer(self, buffer):
+        seconds = len(buffer) * 8 / SPI_SPEED_HZ
+        with self.lock:
+            self.stats["bytes"] += len(buffer)
+            self.stats["spi_seconds"] += seconds
+        if self.time_scale > 0:
+            time.sleep(seconds * self.time_scale)
+
+    def init(self):
+        with self.lock:
+            self.stats["init"] += 1
+        self._busy(INIT_TIME)
+        logger.debug("Emulated e-Paper display initialized")
+
+    def getbuffer(self, image):
+        if image.size != (self.width, self.height):
+            image = image.rotate(90, expand=True)
+        if image.mode != "P":
+            palette = Image.new("P", (1, 1))
+            palette.putpalette(self.palette)
+            image = image.convert("RGB").quantize(palette=palette)
+
+        return self.packer(image)
+
+    def display(self, buffer):
+        self._display(buffer, self.refresh_time)
+        logger.debug("Emulated e-Paper display refreshed")
+
+    def display_fast(self, buffer):
+        if self.fast_time is None:
+            raise RuntimeError(f"Emulator mode {self.mode} has no fast refresh")
+        with self.lock:
+            self.stats["fast"] += 1
+        self._display(buffer, self.fast_time)
+        logger.debug("Emulated e-Paper display fast refreshed")
+
+    def _display(self, buffer, seconds):
+        buffer = bytes(buffer)
+        self._transfer(buffer)
+        self._busy(seconds)
+        with self.lock:
+            self.stats["display"] += 1
+            self.frames.append((time.time(), buffer))
+
+    def Clear(self, color=None):
+        if color is None:
+            color = packing.fill_value(self.white, self.bits)
+        self.display(packing.fill(self.width, self.height, self.bits, color))
+
+    def sleep(self):
+        with self.lock:
+            self.stats["sleep"] += 1
+        self._busy(SLEEP_TIME)
+        logger.debug("Emulated e-Paper display sleep")
+
+    def get_frame(self, index=-1):
+        # Decode a stored framebuffer back to a palette image
+        with self.lock:
+            _, buffer = self.frames[index]
+        return packing.unpack(buffer, self.width, self.height, self.bits, self.palette)
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats, frames=len(self.frames))
+
+    def save_frames(self, directory, count=None):
+        # PNG encoding happens on a background thread, the returned
+        # future resolves to the list of written paths
+        with self.lock:
+            frames = list(self.frames)[-count:] if count else list(self.frames)
+        if self.writer is None:
+            self.writer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="epd-emulator"
+            )
+
+        return self.writer.submit(self._write_frames, directory, frames)
+
+    def _write_frames(self, directory, frames):
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for timestamp, buffer in frames:
+            path = os.path.join(directory, f"frame_{timestamp:.3f}.png")
+            packing.unpack(
+                buffer, self.width, self.height, self.bits, self.palette
+            ).save(path)
+            paths.append(path)
+
+        logger.debug(f"Saved {len(paths)} emulated frame(s) to {directory}")
+        return paths
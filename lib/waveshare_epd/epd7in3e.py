@@ -30,6 +30,7 @@
 
 import logging
 from . import epdconfig
+from . import packing
 
 import PIL
 from PIL import Image
@@ -39,6 +40,34 @@ import io
 EPD_WIDTH = 800
 EPD_HEIGHT = 480
 
+# Longest wait for BUSY, a full refresh takes well under this
+EPD_BUSY_TIMEOUT = 60
+
+# Panel palette, in controller color index order
+EPD_PALETTE = (
+    0,
+    0,
+    0,  # Black
+    255,
+    255,
+    255,  # White
+    255,
+    255,
+    0,  # Yellow
+    255,
+    0,
+    0,  # Red
+    0,
+    0,
+    0,  # (Orange, unused)
+    0,
+    0,
+    255,  # Blue
+    0,
+    255,
+    0,  # Green
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,6 +79,8 @@ class EPD:
         self.cs_pin = epdconfig.CS_PIN
         self.width = EPD_WIDTH
         self.height = EPD_HEIGHT
+        self.palette = EPD_PALETTE
+        self.busy_timeout = EPD_BUSY_TIMEOUT
         self.BLACK = 0x000000  #   0000  BGR
         self.WHITE = 0xFFFFFF  #   0001
         self.YELLOW = 0x00FFFF  #   0010
@@ -83,13 +114,12 @@ class EPD:
     def send_data2(self, data):
         epdconfig.digital_write(self.dc_pin, 1)
         epdconfig.digital_write(self.cs_pin, 0)
-        epdconfig.spi_writebyte2(data)
+        epdconfig.spi_writebuffer(data)
         epdconfig.digital_write(self.cs_pin, 1)
 
     def ReadBusyH(self):
         logger.debug("e-Paper busy H")
-        while epdconfig.digital_read(self.busy_pin) == 0:  # 0: busy, 1: idle
-            epdconfig.delay_ms(5)
+        epdconfig.wait_busy(1, self.busy_timeout)  # 0: busy, 1: idle
         logger.debug("e-Paper busy H release")
 
     def TurnOnDisplay(self):
@@ -180,32 +210,7 @@ class EPD:
     def getbuffer(self, image):
         # Create a pallette with the 7 colors supported by the panel
         pal_image = Image.new("P", (1, 1))
-        pal_image.putpalette(
-            (
-                0,
-                0,
-                0,
-                255,
-                255,
-                255,
-                255,
-                255,
-                0,
-                255,
-                0,
-                0,
-                0,
-                0,
-                0,
-                0,
-                0,
-                255,
-                0,
-                255,
-                0,
-            )
-            + (0, 0, 0) * 249
-        )
+        pal_image.putpalette(EPD_PALETTE + (0, 0, 0) * 249)
         # pal_image.putpalette( (0,0,0,  255,255,255,  0,255,0,   0,0,255,  255,0,0,  255,255,0, 255,128,0) + (0,0,0)*249)
 
         # Check if we need to rotate the image
@@ -221,18 +226,15 @@ class EPD:
             )
 
         # Convert the soruce image to the 7 colors, dithering if needed
-        image_7color = image_temp.convert("RGB").quantize(palette=pal_image)
-        buf_7color = bytearray(image_7color.tobytes("raw"))
+        # P images are expected to already hold indices into EPD_PALETTE
+        if image_temp.mode == "P":
+            image_7color = image_temp
+        else:
+            image_7color = image_temp.convert("RGB").quantize(palette=pal_image)
 
         # PIL does not support 4 bit color, so pack the 4 bits of color
         # into a single byte to transfer to the panel
-        buf = [0x00] * int(self.width * self.height / 2)
-        idx = 0
-        for i in range(0, len(buf_7color), 2):
-            buf[idx] = (buf_7color[i] << 4) + buf_7color[i + 1]
-            idx += 1
-
-        return buf
+        return packing.pack_4bpp(image_7color)
 
     def display(self, image):
         self.send_command(0x10)
@@ -242,7 +244,7 @@ class EPD:
 
     def Clear(self, color=0x11):
         self.send_command(0x10)
-        self.send_data2([color] * int(self.height) * int(self.width / 2))
+        self.send_data2(packing.fill_4bpp(self.width, self.height, color))
 
         self.TurnOnDisplay()
 
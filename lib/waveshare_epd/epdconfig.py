@@ -29,14 +29,160 @@
 
 import os
 import logging
-import sys
 import time
-import subprocess
+import threading
 
 from ctypes import *
 
 logger = logging.getLogger(__name__)
 
+SPI_BUFSIZ_PATH = "/sys/module/spidev/parameters/bufsiz"
+SPI_BUFSIZ_DEFAULT = 4096
+
+
+def spi_chunk_size():
+    # spidev rejects transfers larger than its kernel buffer
+    try:
+        with open(SPI_BUFSIZ_PATH) as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return SPI_BUFSIZ_DEFAULT
+
+
+def spi_chunks(data, size):
+    # Slices of one memoryview, the framebuffer is never copied
+    if not isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data)
+    view = memoryview(data)
+    for start in range(0, len(view), size):
+        yield view[start : start + size]
+
+
+class MockSPI:
+    # Stands in for spidev and the sysfs software SPI library, recording
+    # every transfer so the transfer path can be measured without hardware
+    def __init__(self):
+        self.max_speed_hz = 0
+        self.mode = 0
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+        self.finished = self.started
+
+    def _record(self, size):
+        self.calls += 1
+        self.bytes += size
+        self.finished = time.perf_counter()
+
+    def throughput(self):
+        elapsed = self.finished - self.started
+        return self.bytes / elapsed if elapsed > 0 else 0.0
+
+    def open(self, bus, device):
+        logger.debug(f"Mock SPI open {bus}.{device}")
+
+    def close(self):
+        logger.debug("Mock SPI close")
+
+    def writebytes(self, data):
+        self._record(len(data))
+
+    def writebytes2(self, data):
+        self._record(len(data))
+
+    def xfer3(self, data):
+        self._record(len(data))
+        return [0] * len(data)
+
+    def SYSFS_software_spi_transfer(self, data):
+        self._record(1)
+
+    def SYSFS_software_spi_begin(self):
+        logger.debug("Mock SPI begin")
+
+    def SYSFS_software_spi_end(self):
+        logger.debug("Mock SPI end")
+
+
+class EPDBusyTimeout(TimeoutError):
+    pass
+
+
+# Backoff bounds for polling BUSY when the backend has no edge events
+BUSY_POLL_MIN = 0.001
+BUSY_POLL_MAX = 0.05
+
+
+def poll_level(read, level, timeout):
+    deadline = time.monotonic() + timeout
+    interval = BUSY_POLL_MIN
+    while read() != level:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise EPDBusyTimeout(f"BUSY did not reach {level} within {timeout}s")
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, BUSY_POLL_MAX)
+
+
+def wait_edge(gpio, pin, level, timeout):
+    # RPi.GPIO style wait_for_edge, re-checked so a missed edge cannot stall
+    if not hasattr(gpio, "wait_for_edge"):
+        return poll_level(lambda: gpio.input(pin), level, timeout)
+
+    deadline = time.monotonic() + timeout
+    edge = gpio.RISING if level else gpio.FALLING
+    while gpio.input(pin) != level:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise EPDBusyTimeout(f"BUSY did not reach {level} within {timeout}s")
+        gpio.wait_for_edge(pin, edge, timeout=max(1, int(remaining * 1000)))
+
+
+class MockGPIO:
+    # Simulated GPIO, BUSY reads low (busy) until the time set by set_busy
+    BCM = 11
+    OUT = 0
+    IN = 1
+    RISING = 31
+    FALLING = 32
+
+    def __init__(self):
+        self.busy_until = 0.0
+
+    def set_busy(self, seconds):
+        self.busy_until = time.monotonic() + seconds
+
+    def setmode(self, mode):
+        logger.debug(f"Mock GPIO setmode: {mode}")
+
+    def setwarnings(self, warnings):
+        logger.debug(f"Mock GPIO setwarnings: {warnings}")
+
+    def setup(self, pin, mode):
+        logger.debug(f"Mock GPIO setup pin {pin} mode {mode}")
+
+    def output(self, pin, value):
+        logger.debug(f"Mock GPIO output pin {pin} value {value}")
+
+    def input(self, pin):
+        return 0 if time.monotonic() < self.busy_until else 1
+
+    def wait_for_edge(self, pin, edge, timeout=None):
+        remaining = self.busy_until - time.monotonic()
+        if edge != self.RISING or remaining <= 0:
+            return pin
+        if timeout is not None and timeout / 1000.0 < remaining:
+            time.sleep(timeout / 1000.0)
+            return None
+        time.sleep(remaining)
+        return pin
+
+    def cleanup(self, pins, *args):
+        logger.debug(f"Mock GPIO cleanup pins {pins}")
+
 
 class RaspberryPi:
     # Pin definition
@@ -53,6 +199,7 @@ class RaspberryPi:
         import gpiozero
 
         self.SPI = spidev.SpiDev()
+        self.chunk_size = spi_chunk_size()
         self.GPIO_RST_PIN = gpiozero.LED(self.RST_PIN)
         self.GPIO_DC_PIN = gpiozero.LED(self.DC_PIN)
         # self.GPIO_CS_PIN     = gpiozero.LED(self.CS_PIN)
@@ -96,12 +243,25 @@ class RaspberryPi:
     def delay_ms(self, delaytime):
         time.sleep(delaytime / 1000.0)
 
+    def wait_busy(self, level, timeout):
+        # gpiozero delivers edges from a background thread, no polling needed
+        if level:
+            ready = self.GPIO_BUSY_PIN.wait_for_active(timeout)
+        else:
+            ready = self.GPIO_BUSY_PIN.wait_for_inactive(timeout)
+        if not ready:
+            raise EPDBusyTimeout(f"BUSY did not reach {level} within {timeout}s")
+
     def spi_writebyte(self, data):
         self.SPI.writebytes(data)
 
     def spi_writebyte2(self, data):
         self.SPI.writebytes2(data)
 
+    def spi_writebuffer(self, data):
+        for chunk in spi_chunks(data, self.chunk_size):
+            self.SPI.writebytes2(chunk)
+
     def DEV_SPI_write(self, data):
         self.DEV_SPI.DEV_SPI_SendData(data)
 
@@ -190,7 +350,8 @@ class JetsonNano:
             logger.warning(
                 "Cannot find or load sysfs_software_spi.so - using mock implementation"
             )
-            self.SPI = self._create_mock_spi()
+            self.SPI = MockSPI()
+        self.chunk_size = spi_chunk_size()
 
         try:
             import Jetson.GPIO
@@ -198,55 +359,7 @@ class JetsonNano:
             self.GPIO = Jetson.GPIO
         except ImportError:
             logger.warning("Jetson.GPIO not available - using mock implementation")
-            self.GPIO = self._create_mock_gpio()
-
-    def _create_mock_spi(self):
-        class MockSPI:
-            def SYSFS_software_spi_transfer(self, data):
-                pass
-                logger.debug(f"Mock SPI transfer: {data}")
-
-            def SYSFS_software_spi_begin(self):
-                pass
-                logger.debug("Mock SPI begin")
-
-            def SYSFS_software_spi_end(self):
-                pass
-                logger.debug("Mock SPI end")
-
-        return MockSPI()
-
-    def _create_mock_gpio(self):
-        class MockGPIO:
-            BCM = 11
-            OUT = 0
-            IN = 1
-
-            def setmode(self, mode):
-                pass
-                logger.debug(f"Mock GPIO setmode: {mode}")
-
-            def setwarnings(self, warnings):
-                pass
-                logger.debug(f"Mock GPIO setwarnings: {warnings}")
-
-            def setup(self, pin, mode):
-                pass
-                logger.debug(f"Mock GPIO setup pin {pin} mode {mode}")
-
-            def output(self, pin, value):
-                pass
-                logger.debug(f"Mock GPIO output pin {pin} value {value}")
-
-            def input(self, pin):
-                return 0
-                logger.debug(f"Mock GPIO input pin {pin}")
-
-            def cleanup(self, pins):
-                pass
-                logger.debug(f"Mock GPIO cleanup pins {pins}")
-
-        return MockGPIO()
+            self.GPIO = MockGPIO()
 
     def digital_write(self, pin, value):
         self.GPIO.output(pin, value)
@@ -257,6 +370,9 @@ class JetsonNano:
     def delay_ms(self, delaytime):
         time.sleep(delaytime / 1000.0)
 
+    def wait_busy(self, level, timeout):
+        wait_edge(self.GPIO, self.BUSY_PIN, level, timeout)
+
     def spi_writebyte(self, data):
         self.SPI.SYSFS_software_spi_transfer(data[0])
 
@@ -264,6 +380,13 @@ class JetsonNano:
         for i in range(len(data)):
             self.SPI.SYSFS_software_spi_transfer(data[i])
 
+    def spi_writebuffer(self, data):
+        # The sysfs library only exports a single byte transfer
+        transfer = self.SPI.SYSFS_software_spi_transfer
+        for chunk in spi_chunks(data, self.chunk_size):
+            for value in chunk:
+                transfer(value)
+
     def module_init(self):
         self.GPIO.setmode(self.GPIO.BCM)
         self.GPIO.setwarnings(False)
@@ -307,6 +430,7 @@ class SunriseX3:
 
         self.GPIO = Hobot.GPIO
         self.SPI = spidev.SpiDev()
+        self.chunk_size = spi_chunk_size()
 
     def digital_write(self, pin, value):
         self.GPIO.output(pin, value)
@@ -317,6 +441,9 @@ class SunriseX3:
     def delay_ms(self, delaytime):
         time.sleep(delaytime / 1000.0)
 
+    def wait_busy(self, level, timeout):
+        wait_edge(self.GPIO, self.BUSY_PIN, level, timeout)
+
     def spi_writebyte(self, data):
         self.SPI.writebytes(data)
 
@@ -325,6 +452,10 @@ class SunriseX3:
         #     self.SPI.writebytes([data[i]])
         self.SPI.xfer3(data)
 
+    def spi_writebuffer(self, data):
+        for chunk in spi_chunks(data, self.chunk_size):
+            self.SPI.writebytes2(chunk)
+
     def module_init(self):
         if self.Flag == 0:
             self.Flag = 1
@@ -361,29 +492,88 @@ class SunriseX3:
         )
 
 
-if sys.version_info[0] == 2:
-    process = subprocess.Popen(
-        "cat /proc/cpuinfo | grep Raspberry", shell=True, stdout=subprocess.PIPE
-    )
-else:
-    process = subprocess.Popen(
-        "cat /proc/cpuinfo | grep Raspberry",
-        shell=True,
-        stdout=subprocess.PIPE,
-        text=True,
-    )
-output, _ = process.communicate()
-if sys.version_info[0] == 2:
-    output = output.decode(sys.stdout.encoding)
-
-if "Raspberry" in output:
-    implementation = RaspberryPi()
-elif os.path.exists("/sys/bus/platform/drivers/gpio-x3"):
-    implementation = SunriseX3()
-else:
-    implementation = JetsonNano()
-
-for func in [x for x in dir(implementation) if not x.startswith("_")]:
-    setattr(sys.modules[__name__], func, getattr(implementation, func))
+class Simulated(JetsonNano):
+    # No hardware at all, SPI and GPIO are recorded and simulated
+    def __init__(self):
+        self.SPI = MockSPI()
+        self.GPIO = MockGPIO()
+        self.chunk_size = spi_chunk_size()
+
+
+BACKENDS = {
+    "raspberrypi": RaspberryPi,
+    "sunrise": SunriseX3,
+    "jetson": JetsonNano,
+    "simulated": Simulated,
+}
+BACKEND_ENV = "EPD_BACKEND"
+CPUINFO_PATH = "/proc/cpuinfo"
+
+_backend = None
+_implementation = None
+_implementation_name = None
+_lock = threading.Lock()
+
+
+def detect_backend():
+    override = _backend or os.environ.get(BACKEND_ENV)
+    if override:
+        if override not in BACKENDS:
+            raise ValueError(f"Unknown EPD backend: {override}")
+        return override
+
+    try:
+        with open(CPUINFO_PATH) as f:
+            if "Raspberry" in f.read():
+                return "raspberrypi"
+    except OSError:
+        pass
+    if os.path.exists("/sys/bus/platform/drivers/gpio-x3"):
+        return "sunrise"
+    return "jetson"
+
+
+def set_backend(name):
+    # Must be called before the first hardware access
+    global _backend
+    if name is not None and name not in BACKENDS:
+        raise ValueError(f"Unknown EPD backend: {name}")
+    with _lock:
+        if _implementation is not None:
+            if name != _implementation_name:
+                logger.warning("EPD backend already initialized, ignoring override")
+            return
+        _backend = name
+
+
+def get_implementation():
+    global _implementation, _implementation_name
+    with _lock:
+        if _implementation is None:
+            name = detect_backend()
+            logger.debug(f"Using {name} EPD backend")
+            _implementation = BACKENDS[name]()
+            _implementation_name = name
+
+            # Export the backend methods as module functions, later lookups
+            # no longer go through __getattr__
+            for func in [x for x in dir(_implementation) if not x.startswith("_")]:
+                globals()[func] = getattr(_implementation, func)
+        return _implementation
+
+
+def __getattr__(name):
+    # Hardware is only probed when a backend attribute is first used
+    if name.startswith("_"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if name == "implementation":
+        return get_implementation()
+
+    implementation = get_implementation()
+    try:
+        return getattr(implementation, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 ### END OF FILE ###
@@ -1,8 +1,36 @@
 import logging
 
+from PIL import Image
+
+from . import packing
+
 EPD_WIDTH = 800
 EPD_HEIGHT = 480
 
+EPD_PALETTE = (
+    0,
+    0,
+    0,
+    255,
+    255,
+    255,
+    255,
+    255,
+    0,
+    255,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    0,
+    255,
+    0,
+    255,
+    0,
+)
+
 
 logger = logging.getLogger(__name__)
 
@@ -11,23 +39,52 @@ class EPD:
     def __init__(self):
         self.width = EPD_WIDTH
         self.height = EPD_HEIGHT
+        self.palette = EPD_PALETTE
         self.BLACK = 0x000000
         self.WHITE = 0xFFFFFF
         self.YELLOW = 0x00FFFF
         self.RED = 0x0000FF
         self.BLUE = 0xFF0000
         self.GREEN = 0x00FF00
+        self.frame = None
 
     def init(self):
         logger.debug("Mock e-Paper display initialized")
 
     def display(self, image):
         logger.debug("e-Paper display not available, saving image to file")
-        image.save("test_image.png")
+        self.frame = packing.unpack_4bpp(image, self.width, self.height, self.palette)
+        self.frame.save("test_image.png")
         logger.debug("Image saved to test_image.png")
 
+    def display_windows(self, windows):
+        # Each window is ((x0, y0, x1, y1), packed bytes of that area)
+        if self.frame is None:
+            self.frame = packing.unpack_4bpp(
+                packing.fill_4bpp(self.width, self.height, 0x11),
+                self.width,
+                self.height,
+                self.palette,
+            )
+        for (x0, y0, x1, y1), buffer in windows:
+            window = packing.unpack_4bpp(buffer, x1 - x0, y1 - y0)
+            self.frame.paste(window, (x0, y0))
+        self.frame.save("test_image.png")
+        logger.debug(f"{len(windows)} window(s) saved to test_image.png")
+
     def getbuffer(self, image):
-        return image
+        # Same framebuffer layout as the real driver
+        if image.size != (self.width, self.height):
+            image = image.rotate(90, expand=True)
+        if image.mode != "P":
+            palette = Image.new("P", (1, 1))
+            palette.putpalette(self.palette)
+            image = image.convert("RGB").quantize(palette=palette)
+
+        return packing.pack_4bpp(image)
+
+    def Clear(self, color=0x11):
+        self.display(packing.fill_4bpp(self.width, self.height, color))
 
     def sleep(self):
         logger.debug("Mock e-Paper display sleep")
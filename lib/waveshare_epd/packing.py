@@ -0,0 +1,99 @@
+import functools
+import timeit
+
+from PIL import Image
+
+PACKED_MODES = ("P", "L")
+
+# Pillow raw modes packing palette indices MSB first, rows padded to bytes
+RAW_MODES = {1: "P;1", 2: "P;2", 4: "P;4"}
+
+
+def _raw_mode(bits):
+    raw_mode = RAW_MODES.get(bits)
+    if raw_mode is None:
+        raise ValueError(f"Unsupported bits per pixel: {bits}")
+    return raw_mode
+
+
+def pack(image, bits):
+    # Pillow's raw packers do this in C, e.g. two indices per byte at 4bpp
+    # with the left pixel in the high nibble
+    raw_mode = _raw_mode(bits)
+    if image.mode not in PACKED_MODES:
+        raise ValueError(f"Cannot pack {image.mode} image, expected palette indices")
+    if image.mode == "L":
+        image = Image.frombytes("P", image.size, image.tobytes())
+
+    return image.tobytes("raw", raw_mode)
+
+
+def unpack(buffer, width, height, bits, palette=None):
+    image = Image.frombytes("P", (width, height), bytes(buffer), "raw", _raw_mode(bits))
+    if palette is not None:
+        image.putpalette(palette)
+
+    return image
+
+
+def row_bytes(width, bits):
+    return (width * bits + 7) // 8
+
+
+def fill_value(index, bits):
+    # Byte holding the same palette index in every pixel
+    value = 0
+    for _ in range(8 // bits):
+        value = (value << bits) | index
+    return value
+
+
+@functools.lru_cache(maxsize=8)
+def fill(width, height, bits, value):
+    # value is a whole byte, e.g. 0x11 for two white pixels at 4bpp
+    return bytes([value]) * (row_bytes(width, bits) * height)
+
+
+def pack_1bpp(image):
+    return pack(image, 1)
+
+
+def pack_2bpp(image):
+    return pack(image, 2)
+
+
+def pack_4bpp(image):
+    return pack(image, 4)
+
+
+def unpack_4bpp(buffer, width, height, palette=None):
+    return unpack(buffer, width, height, 4, palette)
+
+
+def fill_4bpp(width, height, value):
+    return fill(width, height, 4, value)
+
+
+PACKERS = {1: pack_1bpp, 2: pack_2bpp, 4: pack_4bpp}
+
+
+def pack_4bpp_loop(image):
+    # Reference implementation the drivers used before, kept for the benchmark
+    indices = bytearray(image.tobytes("raw"))
+    buf = [0x00] * int(image.width * image.height / 2)
+    idx = 0
+    for i in range(0, len(indices), 2):
+        buf[idx] = (indices[i] << 4) + indices[i + 1]
+        idx += 1
+
+    return buf
+
+
+if __name__ == "__main__":
+    frame = Image.effect_noise((800, 480), 64).point(lambda value: value % 7)
+    frame = Image.frombytes("P", frame.size, frame.tobytes())
+    assert bytes(pack_4bpp_loop(frame)) == pack_4bpp(frame)
+
+    for function in (pack_4bpp_loop, pack_4bpp):
+        seconds = min(timeit.repeat(lambda: function(frame), number=5, repeat=3)) / 5
+        print(f"{function.__name__:>16}: {seconds * 1000:8.2f} ms")
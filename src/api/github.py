@@ -1,4 +1,6 @@
 import logging
+import asyncio
+import aiohttp
 import requests
 import os
 
@@ -10,6 +12,17 @@ def get_github_contributions(username, token, year=None):
     logger.debug(f"Fetching contributions for user: {username}")
     result = _graphql_query(username, token, year)
 
+    return _format_contributions(username, result)
+
+
+async def get_github_contributions_async(session, username, token, year=None):
+    logger.debug(f"Fetching contributions for user: {username}")
+    result = await _graphql_query_async(session, username, token, year)
+
+    return _format_contributions(username, result)
+
+
+def _format_contributions(username, result):
     if result is None:
         logger.debug(f"No contributions found for user: {username}")
         return None
@@ -29,7 +42,7 @@ def get_github_contributions(username, token, year=None):
     return contributions
 
 
-def _graphql_query(username, token, year=None):
+def _graphql_request(username, token, year=None):
     url = "https://api.github.com/graphql"
     headers = {
         "Authorization": f"Bearer {token}",
@@ -63,26 +76,50 @@ def _graphql_query(username, token, year=None):
 
     payload = {"query": query, "variables": variables}
 
+    return url, payload, headers
+
+
+def _graphql_result(data):
+    if data is None:
+        return None
+    if data.get("data") is None:
+        return None
+    if data.get("data").get("user") is None:
+        return None
+
+    return data.get("data").get("user").get("contributionsCollection", {})
+
+
+def _graphql_query(username, token, year=None):
+    url, payload, headers = _graphql_request(username, token, year)
+
     try:
         logger.debug(f"> Sending GraphQL request to {url}")
         response = requests.post(url, json=payload, headers=headers)
         logger.debug(f"> Received response: {response.status_code}")
 
         response.raise_for_status()
-        data = response.json()
-        if data is None:
-            return None
-        if data.get("data") is None:
-            return None
-        if data.get("data").get("user") is None:
-            return None
-
-        return data.get("data").get("user").get("contributionsCollection", {})
+        return _graphql_result(response.json())
     except requests.RequestException as e:
         print(f"Error fetching contributions: {e}")
         return None
 
 
+async def _graphql_query_async(session, username, token, year=None):
+    url, payload, headers = _graphql_request(username, token, year)
+
+    try:
+        logger.debug(f"> Sending GraphQL request to {url}")
+        async with session.post(url, json=payload, headers=headers) as response:
+            logger.debug(f"> Received response: {response.status}")
+
+            response.raise_for_status()
+            return _graphql_result(await response.json())
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"Error fetching contributions: {e}")
+        return None
+
+
 if __name__ == "__main__":
     username = "TEST_USERNAME"
     token = os.getenv("GITHUB_TOKEN")
@@ -1,4 +1,6 @@
 import logging
+import asyncio
+import aiohttp
 import requests
 from icalendar import Calendar
 from datetime import date, datetime, timedelta, time
@@ -24,7 +26,7 @@ def get_events(ical_urls, use_cache=False, filter=True):
         ical_urls = [ical_urls]
 
     logger.debug(f"> Fetching events from {len(ical_urls)} iCal URLs")
-    calendar = None
+    contents = []
     for ical_url in ical_urls:
         try:
             logger.debug(f"> Fetching events from iCal URL: {ical_url}")
@@ -32,15 +34,66 @@ def get_events(ical_urls, use_cache=False, filter=True):
             logger.debug(f"> API response status code: {response.status_code}")
 
             response.raise_for_status()
+            contents.append(response.content)
+
+        except Exception as e:
+            logger.error(f"> Error fetching {ical_url}: {e}")
+
+    return _build_events(contents, use_cache)
+
+
+async def get_events_async(session, ical_urls, use_cache=False, filter=True):
+    logger.debug("Fetching events from iCal URLs")
+
+    # Load cached calendar if requested
+    if use_cache:
+        logger.debug("> Loading cached calendar")
+        cached_calendar = _load_cache()
+        if cached_calendar:
+            logger.debug("> Cached calendar loaded successfully")
+            return _extract_events(cached_calendar)
+        logger.debug("> No cached calendar found")
+
+    if not isinstance(ical_urls, list):
+        ical_urls = [ical_urls]
+
+    # All calendars are requested concurrently, failed ones are skipped
+    logger.debug(f"> Fetching events from {len(ical_urls)} iCal URLs")
+    results = await asyncio.gather(
+        *[_fetch_async(session, ical_url) for ical_url in ical_urls]
+    )
+    contents = [content for content in results if content is not None]
+
+    return _build_events(contents, use_cache)
+
+
+async def _fetch_async(session, ical_url):
+    try:
+        logger.debug(f"> Fetching events from iCal URL: {ical_url}")
+        async with session.get(ical_url) as response:
+            logger.debug(f"> API response status code: {response.status}")
+
+            response.raise_for_status()
+            return await response.read()
+
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"> Error fetching {ical_url}: {e}")
+        return None
+
+
+def _build_events(contents, use_cache=False):
+    calendar = None
+    for content in contents:
+        try:
             if calendar is None:
-                calendar = Calendar.from_ical(response.content)
+                calendar = Calendar.from_ical(content)
             else:
-                temp_calendar = Calendar.from_ical(response.content)
+                temp_calendar = Calendar.from_ical(content)
                 for component in temp_calendar.walk("vevent"):
                     calendar.add_component(component)
 
         except Exception as e:
-            logger.error(f"> Error fetching {ical_url}: {e}")
+            logger.error(f"> Error parsing calendar: {e}")
 
     if calendar is None:
         return []
@@ -1,4 +1,6 @@
 import logging
+import asyncio
+import aiohttp
 import requests
 from base64 import b64encode
 from datetime import datetime, timedelta
@@ -83,6 +85,74 @@ def get_workspace_projects(auth, workspace_id):
         return {}
 
 
+# ----- Async -----------------------------------------------------
+def _headers(auth):
+    return {
+        "content-type": "application/json",
+        "Authorization": "Basic %s" % b64encode(auth.encode("ascii")).decode("ascii"),
+    }
+
+
+async def verify_api_key_async(session, auth):
+    logger.debug("Verifying API key")
+
+    try:
+        logger.debug("> Sending request to Toggl API (api/v9/me)")
+        async with session.get(
+            "https://api.track.toggl.com/api/v9/me", headers=_headers(auth)
+        ) as data:
+            logger.debug(f"> API response status code: {data.status}")
+            if data.status != 200:
+                return None
+
+            return (await data.json()).get("default_workspace_id")
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        logger.error(f"> Error verifying API key: {e}")
+        return None
+
+
+async def get_time_entries_async(session, auth, start_date, end_date=None):
+    logger.debug("Fetching time entries.")
+
+    end_date = end_date or (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    params = {"start_date": start_date, "end_date": end_date}
+
+    try:
+        logger.debug("> Sending request to Toggl API (api/v9/me/time_entries)")
+        async with session.get(
+            "https://api.track.toggl.com/api/v9/me/time_entries",
+            headers=_headers(auth),
+            params=params,
+        ) as data:
+            logger.debug(f"> API response status code: {data.status}")
+
+            return await data.json()
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        logger.error(f"> Error fetching time entries: {e}")
+        return []
+
+
+async def get_workspace_projects_async(session, auth, workspace_id):
+    logger.debug(f"Fetching projects for workspace ID: {workspace_id}")
+    try:
+        logger.debug(
+            "> Sending request to Toggl API (api/v9/workspaces/{workspace_id}/projects)"
+        )
+        async with session.get(
+            f"https://api.track.toggl.com/api/v9/workspaces/{workspace_id}/projects",
+            headers=_headers(auth),
+        ) as data:
+            logger.debug(f"> API response status code: {data.status}")
+
+            projects = {}
+            for project in await data.json():
+                projects[project.get("id")] = project
+            return projects
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+        logger.error(f"> Error fetching workspace projects: {e}")
+        return {}
+
+
 if __name__ == "__main__":
     auth = "<your_api_key>:api_token"
     print(verify_api_key(auth))
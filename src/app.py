@@ -1,10 +1,18 @@
+import asyncio
 import logging
-from time import sleep
-from datetime import datetime
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
 
 from src.setting import Setting
-from src.panels.loader import load_panel
+from src.file_watcher import FileWatcher
+from src.panel_pool import PanelPool
+from src.panels.loader import load_panel, reload_panel
+from src.panels.composite_panel import CompositePanel
 from src.display.epd_manager import EPDManager
+from src.display.display_worker import DisplayWorker
+import src.default as Default
 
 logger = logging.getLogger(__name__)
 
@@ -12,52 +20,368 @@ class Application:
     def __init__(self, settings_file: str, debug:bool=False):
         self.debug = debug
         self.settings = Setting(settings_file)
-        self.epd_manager = EPDManager(self.settings.get_epd_name())
+        self.epd_manager = EPDManager(
+            self.settings.get_epd_name(),
+            self.settings.get_epd_idle_timeout(),
+            self.settings.get_epd_backend(),
+        )
+
+        self.display_worker = DisplayWorker(self.epd_manager)
 
         self.settings.set_epd_settings(self.epd_manager.epd)
 
-        self.panels = {}
+        self.panels = PanelPool(
+            self.settings.get_panel_memory_budget(),
+            self.settings.get_panel_pool_size(),
+        )
         self.running = False
 
+        # Event loop state, panel loading and drawing run on a single
+        # render thread so the loop keeps serving fetch tasks meanwhile
+        self.loop = None
+        self.main_task = None
+        self.wakeup = None
+        self.fetch_tasks = []
+        self.prewarm_task = None
+        self.renderer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="render")
+        # Prewarmed panels are constructed beside the render thread
+        self.builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="build")
+
+        # Settings hot reload, watcher events are handed to the event loop
+        self.watcher = None
+        self.reloaded = False
+        watch_backend = self.settings.get_watch_backend()
+        if watch_backend:
+            self.watcher = FileWatcher(
+                self.settings.get_watch_paths(),
+                self._on_file_change,
+                watch_backend,
+            )
+
     def run(self):
         logger.info("Starting application loop")
+        try:
+            asyncio.run(self.run_async())
+        except asyncio.CancelledError:
+            logger.info("Application loop cancelled")
+
+    async def run_async(self):
+        self.loop = asyncio.get_running_loop()
+        self.main_task = asyncio.current_task()
+        self.wakeup = asyncio.Event()
         self.running = True
-        last_update = datetime.min
-        duration = 0
+        self.display_worker.start()
+        if self.watcher is not None:
+            self.watcher.start()
+            self.settings.watching = True
+        rotation = datetime.min
+        bedtime = None
+        panel_id = None
+        prewarm_at = None
 
-        while self.running:
-            full_refresh = False
-            now = datetime.now()
+        try:
+            timeout = aiohttp.ClientTimeout(total=Default.REQUEST_TIMEOUT)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                while self.running:
+                    full_refresh = False
+                    now = datetime.now()
+
+                    reloaded = self.reloaded
+                    if reloaded:
+                        self.reloaded = False
+                        await self.loop.run_in_executor(
+                            self.renderer, self._rebuild_panels
+                        )
+                        if panel_id not in range(len(self.settings.panels)):
+                            # The displayed panel is gone, move on with the schedule
+                            rotation = now
+
+                    if now >= rotation or self.settings.is_bedtime() != bedtime:
+                        self._cancel_prewarm()
+                        panel_id, current_panel_spec, duration = self.settings.get_next_panel()
+                        logger.info(f"Displaying panel {panel_id} for {duration} seconds")
+                        rotation = now + timedelta(seconds=duration)
+                        bedtime = self.settings.is_bedtime()
+                        full_refresh = True
+
+                        prewarm_at = None
+                        prewarm_lead = self.settings.get_prewarm_lead()
+                        if prewarm_lead:
+                            prewarm_at = max(now, rotation - timedelta(seconds=prewarm_lead))
+
+                        # Only panel specs with "refresh" are redrawn during their
+                        # slot, the others are drawn once per rotation
+                        refresh = current_panel_spec.get("refresh", False)
+
+                        panel = await self._get_panel(panel_id, current_panel_spec)
+                        await self._start_fetching(panel, session, refresh)
+                        await self.loop.run_in_executor(
+                            self.renderer, self._trim_panels, panel_id
+                        )
+
+                    elif reloaded:
+                        previous = panel
+                        current_panel_spec = self.settings.panels[panel_id]
+                        refresh = current_panel_spec.get("refresh", False)
+
+                        panel = await self._get_panel(panel_id, current_panel_spec)
+                        if panel is not previous:
+                            logger.info(f"Panel {panel_id} changed, displaying rebuilt panel")
+                            await self._start_fetching(panel, session, refresh)
+                            full_refresh = True
+
+                    # A fetch finishing while drawing wakes the next iteration
+                    self.wakeup.clear()
+                    image, changed = await self.loop.run_in_executor(
+                        self.renderer, self._render, panel
+                    )
+
+                    if changed or full_refresh:
+                        self.display_worker.submit(image, full_refresh=full_refresh)
+                    else:
+                        logger.debug("Image unchanged, skipping update")
+
+                    # Queued behind the current frame on the render thread
+                    if prewarm_at is not None and datetime.now() >= prewarm_at:
+                        prewarm_at = None
+                        self._start_prewarm(panel_id, rotation, session)
+
+                    deadline = self._next_deadline(
+                        panel if refresh else None, rotation, prewarm_at
+                    )
+                    logger.debug(f"Sleeping until {deadline}")
+                    try:
+                        await asyncio.wait_for(
+                            self.wakeup.wait(), self._seconds_until(deadline)
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            self.running = False
+            self._cancel_fetching()
+            self._cancel_prewarm()
+            if self.watcher is not None:
+                self.watcher.stop()
+                self.settings.watching = False
+            self.panels.clear()
+            # Let an in-flight refresh finish, but do not start a queued one
+            self.display_worker.stop(drain=False)
+            self.renderer.shutdown(wait=False)
+            self.builder.shutdown(wait=False)
+            self.epd_manager.cleanup()
+
+    def _on_file_change(self):
+        if self.loop is not None and self.running:
+            self.loop.call_soon_threadsafe(self._reload_settings)
+
+    def _reload_settings(self):
+        if not self.settings.reload():
+            return
+
+        self.watcher.set_paths(self.settings.get_watch_paths())
+        self.reloaded = True
+        self.wakeup.set()
+
+    def _rebuild_panels(self):
+        # Loaded panels are first matched to the new specs by equality, so a
+        # moved panel is reused, what is left is rebuilt partially by id
+        unused = {panel_id: self.panels.pop(panel_id) for panel_id, _ in self.panels.items()}
+        for panel_id, panel_spec in enumerate(self.settings.panels):
+            for old_id, old in unused.items():
+                if old.spec is not None and old.spec == panel_spec:
+                    self.panels[panel_id] = unused.pop(old_id)
+                    break
+
+        for panel_id, panel_spec in enumerate(self.settings.panels):
+            if panel_id not in self.panels and panel_id in unused:
+                self.panels[panel_id] = reload_panel(
+                    unused.pop(panel_id), panel_spec, DEBUG=self.debug
+                )
 
-            if (now - last_update).total_seconds() > duration:
-                panel_id, current_panel_spec, duration = self.settings.get_next_panel()
-                logger.info(f"Displaying panel {panel_id} for {duration} seconds")
-                last_update = now
-                full_refresh = True
+        # Panels whose spec is gone are not coming back
+        for panel in unused.values():
+            panel.teardown()
 
-                if current_panel_spec.get("refresh", False):
-                    refresh_interval = self.settings.get_refresh_interval()
-                else:
-                    refresh_interval = duration
+    def _trim_panels(self, panel_id):
+        keep = self.settings.get_upcoming_panels() | {panel_id}
+        self.panels.trim(keep)
+        logger.debug(f"Panel pool: {self.panels.get_stats()}")
 
-            if panel_id not in self.panels:
-                self.panels[panel_id] = load_panel(current_panel_spec, DEBUG=self.debug)
+    async def _get_panel(self, panel_id, panel_spec):
+        return await self.loop.run_in_executor(
+            self.renderer,
+            self.panels.load,
+            panel_id,
+            panel_spec,
+            lambda spec: load_panel(spec, DEBUG=self.debug),
+        )
 
-            image = self.panels[panel_id].draw()
+    async def _build_panel(self, panel_id, panel_spec):
+        # Construction can block on files and fonts, so a panel that is not
+        # pooled yet is built on the builder thread and only handed to the
+        # pool on the render thread
+        if panel_id in self.panels:
+            return await self._get_panel(panel_id, panel_spec)
 
-            if self.panels[panel_id].needs_refresh() or full_refresh:
-                self.epd_manager.set_panel(image, full_refresh=full_refresh)
-            else:
-                logger.debug("Image unchanged, skipping update")
+        build = self.loop.run_in_executor(
+            self.builder, lambda: load_panel(panel_spec, DEBUG=self.debug)
+        )
+        try:
+            built = await asyncio.shield(build)
+        except asyncio.CancelledError:
+            build.add_done_callback(self._discard_panel)
+            raise
 
-            self._sleep_interruptible(refresh_interval)
+        panel = await self.loop.run_in_executor(
+            self.renderer, self.panels.load, panel_id, panel_spec, lambda spec: built
+        )
+        if panel is not built:
+            built.teardown()
 
-    def _sleep_interruptible(self, seconds: int):
-        slept = 0
-        while slept < seconds and self.running:
-            sleep(min(1, seconds - slept))
-            slept += 1
+        return panel
+
+    def _discard_panel(self, build):
+        if not build.cancelled() and build.exception() is None:
+            build.result().teardown()
+
+    def _next_deadline(self, panel, rotation, prewarm_at=None):
+        # Earliest moment anything on screen can change, panels with fetch
+        # tasks wake the loop themselves when their data does. Without a
+        # panel only the schedule counts
+        now = datetime.now()
+        deadlines = [
+            rotation,
+            panel.next_deadline(now) if panel is not None else None,
+            self.settings.get_bedtime_deadline(now),
+            prewarm_at,
+        ]
+
+        return min(deadline for deadline in deadlines if deadline is not None)
+
+    def _seconds_until(self, deadline):
+        return max(0, (deadline - datetime.now()).total_seconds())
+
+    def _render(self, panel):
+        image = panel.draw()
+        return image, panel.needs_refresh()
+
+    def _get_fetch_panels(self, panel):
+        if isinstance(panel, CompositePanel):
+            return [
+                leaf
+                for inner, _ in panel.get_panels()
+                for leaf in self._get_fetch_panels(inner)
+            ]
+        if panel.get_fetch_interval() is None:
+            return []
+
+        return [panel]
+
+    async def _start_fetching(self, panel, session, refresh=True):
+        self._cancel_fetching()
+        panels = self._get_fetch_panels(panel)
+        for fetch_panel in panels:
+            fetch_panel.fetch_async = True
+
+        # Panels with expired data get a short head start before the panel
+        # is drawn, a slower fetch redraws through the wakeup event once it lands
+        now = datetime.now()
+        first = {
+            p: asyncio.create_task(self._fetch(p, session, wake=refresh))
+            for p in panels
+            if p.get_fetch_deadline() <= now
+        }
+        if not refresh:
+            # Drawn once per rotation, so wait for the data and fetch no more
+            self.fetch_tasks = list(first.values())
+            if first:
+                await asyncio.wait(first.values())
+            return
+
+        self.fetch_tasks = list(first.values()) + [
+            asyncio.create_task(self._fetch_loop(p, session, first.get(p)))
+            for p in panels
+        ]
+        if first:
+            await asyncio.wait(first.values(), timeout=Default.REQUEST_GRACE)
+
+    async def _fetch_loop(self, panel, session, first=None):
+        if first is not None:
+            await first
+        while True:
+            deadline = panel.get_fetch_deadline()
+            if deadline <= datetime.now():
+                # A failed fetch leaves the deadline behind, retry after an interval
+                deadline = datetime.now() + timedelta(
+                    seconds=panel.get_fetch_interval()
+                )
+            await asyncio.sleep(self._seconds_until(deadline))
+            await self._fetch(panel, session)
+
+    async def _fetch(self, panel, session, wake=True):
+        try:
+            if await panel.fetch(session) and wake:
+                self.wakeup.set()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching data for {type(panel).__name__}: {e}")
+
+    def _start_prewarm(self, panel_id, rotation, session):
+        next_id, next_spec = self.settings.peek_next_panel(rotation)
+        if next_id == panel_id:
+            return
+
+        self.prewarm_task = asyncio.create_task(
+            self._prewarm(next_id, next_spec, session)
+        )
+
+    async def _prewarm(self, panel_id, panel_spec, session):
+        # Build, fetch and render the upcoming panel during the current
+        # slot, so that switching to it is a display push from the cache
+        logger.debug(f"Prewarming panel {panel_id}")
+        try:
+            panel = await self._build_panel(panel_id, panel_spec)
+
+            panels = self._get_fetch_panels(panel)
+            for fetch_panel in panels:
+                fetch_panel.fetch_async = True
+            now = datetime.now()
+            await asyncio.gather(
+                *[
+                    self._fetch(fetch_panel, session, wake=False)
+                    for fetch_panel in panels
+                    if fetch_panel.get_fetch_deadline() <= now
+                ]
+            )
+
+            await self.loop.run_in_executor(self.renderer, panel.draw)
+            logger.debug(f"Prewarmed panel {panel_id}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error prewarming panel {panel_id}: {e}")
+
+    def _cancel_prewarm(self):
+        if self.prewarm_task is not None:
+            self.prewarm_task.cancel()
+            self.prewarm_task = None
+
+    def _cancel_fetching(self):
+        for task in self.fetch_tasks:
+            task.cancel()
+        self.fetch_tasks = []
 
     def stop(self):
+        if self.main_task is not None:
+            # Cancelling the main task unwinds run_async, which cleans up
+            if self.running:
+                self.running = False
+                self.loop.call_soon_threadsafe(self.main_task.cancel)
+            return
+
         self.running = False
+        self.display_worker.stop(drain=False)
+        self.renderer.shutdown(wait=False)
+        self.builder.shutdown(wait=False)
         self.epd_manager.cleanup()
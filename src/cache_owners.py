@@ -0,0 +1,66 @@
+import threading
+import weakref
+from contextlib import contextmanager
+
+_local = threading.local()
+_tables = []
+
+
+class OwnerTable:
+    # Which panels use each entry of a shared cache, so that suspending a
+    # panel evicts only the entries no other panel is still using
+    def __init__(self, lock, evict):
+        self.lock = lock
+        self.evict = evict
+        self.owners = {}
+        self.keys = weakref.WeakKeyDictionary()
+        _tables.append(self)
+
+    def add(self, key):
+        # Called with the cache lock held
+        owner = get_owner()
+        if owner is None:
+            return
+
+        self.owners.setdefault(key, weakref.WeakSet()).add(owner)
+        self.keys.setdefault(owner, set()).add(key)
+
+    def discard(self, key):
+        # Called with the cache lock held when the cache drops the entry
+        self.owners.pop(key, None)
+
+    def release(self, owner):
+        with self.lock:
+            for key in self.keys.pop(owner, ()):
+                owners = self.owners.get(key)
+                if owners is None:
+                    continue
+
+                owners.discard(owner)
+                if not owners:
+                    del self.owners[key]
+                    self.evict(key)
+
+    def clear(self):
+        self.owners.clear()
+        self.keys.clear()
+
+
+def get_owner():
+    return getattr(_local, "owner", None)
+
+
+@contextmanager
+def owner(panel):
+    # Cache entries used while drawing on this thread belong to the panel
+    previous = get_owner()
+    _local.owner = panel
+    try:
+        yield
+    finally:
+        _local.owner = previous
+
+
+def release(panel):
+    for table in _tables:
+        table.release(panel)
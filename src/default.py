@@ -4,6 +4,9 @@ FONT = "fonts/roboto_mono/static/RobotoMono-Regular.ttf"
 FONT_EMOJI = "fonts/noto_sans_with_emoji/NotoSansWithEmoji-Scaled.ttf"
 FONT_SIZE = {"H1": 96, "H2": 24, "p": 10}
 FONT_COLOR = "black"
+FONT_CACHE_SIZE = 64
+TEXT_CACHE_SIZE = 1024
+SPRITE_CACHE_SIZE = 256
 # Outline
 OUTLINE_COLOR = None
 OUTLINE_SIZE = 2
@@ -21,7 +24,19 @@ BACKGROUND_COLOR = "white"
 # Time
 DURATION_PANEL = 5
 DURATION_REFRESH = 60
+EPD_IDLE_TIMEOUT = 120
+REQUEST_TIMEOUT = 30
+REQUEST_GRACE = 5
+
+# Panel pool, the memory budget is in MB
+PANEL_MEMORY_BUDGET = 64
+PANEL_POOL_SIZE = 8
+PANEL_LOOKAHEAD = 2
+PREWARM_LEAD = 30
 
 # File
 SETTINGS_FILE = "example/setting.json"
 PANEL_SPEC_FILE = "example/panels.json"
+WATCH_BACKEND = "auto"
+WATCH_DEBOUNCE = 0.5
+WATCH_INTERVAL = 1
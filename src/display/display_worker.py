@@ -0,0 +1,86 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class DisplayWorker:
+    def __init__(self, epd_manager):
+        self.epd_manager = epd_manager
+
+        # Single pending frame, newer submissions replace it
+        self.pending = None
+        self.condition = threading.Condition()
+        self.busy = False
+        self.running = False
+        self.thread = None
+        self.metrics = {"submitted": 0, "dropped": 0, "displayed": 0, "errors": 0}
+
+    def start(self):
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+
+        self.thread = threading.Thread(target=self._run, name="display-worker", daemon=True)
+        self.thread.start()
+        logger.debug("Display worker started")
+
+    def submit(self, image, full_refresh: bool=True):
+        with self.condition:
+            self.metrics["submitted"] += 1
+            if self.pending is not None:
+                # A dropped frame must not lose its full refresh request
+                full_refresh = full_refresh or self.pending[1]
+                self.metrics["dropped"] += 1
+                logger.debug("Dropping stale frame in favour of a newer one")
+
+            self.pending = (image, full_refresh)
+            self.condition.notify()
+
+    def wait_idle(self, timeout: float=None):
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: self.pending is None and not self.busy, timeout
+            )
+
+    def stop(self, drain: bool=True, timeout: float=None):
+        with self.condition:
+            if not drain and self.pending is not None:
+                logger.debug("Cancelling pending frame")
+                self.pending = None
+            self.running = False
+            self.condition.notify_all()
+
+        if self.thread is not None:
+            self.thread.join(timeout)
+            if self.thread.is_alive():
+                logger.warning("Display worker did not stop in time")
+            self.thread = None
+        logger.debug("Display worker stopped")
+
+    def get_metrics(self):
+        with self.condition:
+            return dict(self.metrics)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending is not None or not self.running)
+                if self.pending is None:
+                    return
+
+                image, full_refresh = self.pending
+                self.pending = None
+                self.busy = True
+
+            try:
+                self.epd_manager.set_panel(image, full_refresh=full_refresh)
+                displayed = True
+            except Exception as e:
+                logger.exception(f"Error displaying frame: {e}")
+                displayed = False
+
+            with self.condition:
+                self.busy = False
+                self.metrics["displayed" if displayed else "errors"] += 1
+                self.condition.notify_all()
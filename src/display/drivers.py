@@ -0,0 +1,113 @@
+import os
+import sys
+import logging
+import importlib
+
+from src.palette import PALETTE
+
+logger = logging.getLogger(__name__)
+
+# Display drivers by name. Modules are only imported when a driver is
+# loaded, "palette" names the rendering palette in src.palette.PALETTE.
+DRIVERS = {}
+
+
+def register_driver(
+    name: str,
+    module: str,
+    width: int,
+    height: int,
+    palette: str,
+    bits: int,
+    partial_refresh: bool=False,
+    fast_refresh: bool=False,
+    options: dict=None,
+):
+    DRIVERS[name] = {
+        "name": name,
+        "module": module,
+        "width": width,
+        "height": height,
+        "palette": palette,
+        "bits": bits,
+        "partial_refresh": partial_refresh,
+        "fast_refresh": fast_refresh,
+        "options": options or {},
+    }
+
+
+def get_driver(name: str):
+    driver = DRIVERS.get(name)
+    if driver is None:
+        raise ValueError(f"Unsupported e-Paper display: {name}")
+    return driver
+
+
+def list_drivers():
+    return sorted(DRIVERS)
+
+
+def load_driver(name: str, backend: str=None):
+    driver = get_driver(name)
+
+    basedir = os.path.dirname(os.path.realpath(__file__))
+    libdir = os.path.abspath(os.path.join(basedir, "../../lib"))
+    if os.path.exists(libdir) and libdir not in sys.path:
+        logger.debug(f"Adding library directory to sys.path: {libdir}")
+        sys.path.append(libdir)
+
+    # Hardware backend override for the Waveshare drivers, applied before
+    # epdconfig probes the board
+    if backend is not None:
+        importlib.import_module("waveshare_epd.epdconfig").set_backend(backend)
+
+    logger.debug(f"Importing e-Paper driver {name} from {driver['module']}")
+    epd_lib = importlib.import_module(driver["module"])
+    return epd_lib.EPD(**driver["options"])
+
+
+register_driver(
+    "epd7in3e",
+    "waveshare_epd.epd7in3e",
+    800,
+    480,
+    "6_colors",
+    4,
+)
+register_driver(
+    "mock",
+    "waveshare_epd.mock",
+    800,
+    480,
+    "6_colors",
+    4,
+    partial_refresh=True,
+)
+register_driver(
+    "emulator",
+    "waveshare_epd.emulator",
+    800,
+    480,
+    "6_colors",
+    4,
+)
+register_driver(
+    "emulator_mono",
+    "waveshare_epd.emulator",
+    800,
+    480,
+    "mono",
+    1,
+    fast_refresh=True,
+    options={"mode": "mono"},
+)
+register_driver(
+    "emulator_gray",
+    "waveshare_epd.emulator",
+    800,
+    480,
+    "gray",
+    2,
+    # The emulated controller shows the rendering palette, 2 bits per level
+    options={"mode": "gray", "palette": tuple(PALETTE["gray"][: 3 * 2**2])},
+)
@@ -1,32 +1,48 @@
-import os
-import sys
+import hashlib
 import logging
+import threading
+
+import src.helper as Helper
+import src.default as Default
+from src.display import framebuffer as FrameBuffer
+from src.display import drivers as Drivers
 
 logger = logging.getLogger(__name__)
 
+# Partial refresh limits, beyond these a full refresh is cheaper
+MAX_DIRTY_RECTS = 8
+MAX_DIRTY_AREA = 0.5
+
+# Controller power states
+POWER_SLEEP = "sleep"
+POWER_AWAKE = "awake"
+
 class EPDManager:
-    def __init__(self, display_name: str):
+    def __init__(self, display_name: str, idle_timeout: float=Default.EPD_IDLE_TIMEOUT, backend: str=None):
         self.epd = None
-        self._initialize_epd(display_name)
+        self.driver = None
+        self.last_buffer = None
+        self.last_digest = None
+        self.metrics = {"frames": 0, "skipped": 0, "full": 0, "partial": 0, "fast": 0, "wakes": 0, "timeouts": 0}
+
+        # Power state, the controller sleeps after idle_timeout seconds without updates
+        self.idle_timeout = idle_timeout
+        self.power_state = POWER_SLEEP
+        self.power_lock = threading.RLock()
+        self.idle_timer = None
 
-    def _initialize_epd(self, name: str):
-        basedir = os.path.dirname(os.path.realpath(__file__))
-        libdir = os.path.abspath(os.path.join(basedir, "../../lib"))
-        logger.debug(f"Adding library directory to sys.path: {libdir}")
+        self._initialize_epd(display_name, backend)
 
-        if os.path.exists(libdir) and libdir not in sys.path:
-            sys.path.append(libdir)
+    def _initialize_epd(self, name: str, backend: str=None):
+        if name not in Drivers.DRIVERS:
+            logger.warning(f"Unsupported e-Paper display name: {name}")
+            logger.warning("Using mock e-Paper display instead.")
+            name = "mock"
 
-        # Configure EPD library
+        # Configure EPD library, only the selected driver is imported
         try:
-            if name == "epd7in3e":
-                from waveshare_epd import epd7in3e as epd_lib
-            else:
-                logger.warning(f"Unsupported e-Paper display name: {name}")
-                logger.warning("Using mock e-Paper display instead.")
-                from waveshare_epd import mock as epd_lib
-
-            self.epd = epd_lib.EPD()
+            self.driver = Drivers.get_driver(name)
+            self.epd = Drivers.load_driver(name, backend)
             logger.info("e-Paper library imported successfully.")
 
         except Exception as e:
@@ -34,18 +50,136 @@ class EPDManager:
             raise RuntimeError("Failed to import e-Paper library")
 
     def set_panel(self, image, full_refresh: bool=True):
-        if not full_refresh:
-            logger.warning("Partial refresh not implemented")
-            # TODO
+        with self.power_lock:
+            try:
+                self._set_panel(image, full_refresh)
+            except TimeoutError as e:
+                self._recover(e)
 
+    def _set_panel(self, image, full_refresh):
         logger.debug("Displaying image on e-Paper display")
-        self.epd.init()
-        self.epd.display(self.epd.getbuffer(image))
-        self.epd.sleep()
+        frame = self._quantize(image)
+        buffer = self.epd.getbuffer(frame)
+        self.metrics["frames"] += 1
+
+        # Identical frames are skipped even when a full refresh was requested
+        digest = hashlib.blake2b(buffer, digest_size=16).digest()
+        if digest == self.last_digest:
+            logger.debug("Framebuffer unchanged, skipping update")
+            self.metrics["skipped"] += 1
+            return
+
+        rects = None
+        if not full_refresh:
+            rects = self._get_dirty_rects(buffer)
+
+        self._wake()
+        if rects:
+            logger.debug(f"Partial refresh of {len(rects)} window(s): {rects}")
+            windows = [
+                (rect, FrameBuffer.crop_buffer(buffer, self.epd.width, rect, self.driver["bits"]))
+                for rect in rects
+            ]
+            self.epd.display_windows(windows)
+            self.metrics["partial"] += 1
+        elif not full_refresh and self.driver["fast_refresh"]:
+            # Drivers with a fast waveform update the whole frame quicker
+            self.epd.display_fast(buffer)
+            self.metrics["fast"] += 1
+        else:
+            self.epd.display(buffer)
+            self.metrics["full"] += 1
+        self._schedule_sleep()
+        self.last_digest = digest
+        # The buffer itself is only needed for diffing on windowed drivers
+        if self.driver["partial_refresh"]:
+            self.last_buffer = buffer
         logger.debug("Image displayed successfully on e-Paper display")
 
+    def _get_dirty_rects(self, buffer):
+        # None means the frame needs a full refresh
+        if not self.driver["partial_refresh"]:
+            return None
+        if self.last_buffer is None or len(self.last_buffer) != len(buffer):
+            return None
+
+        rects = FrameBuffer.diff_buffers(
+            self.last_buffer, buffer, self.epd.width, self.driver["bits"]
+        )
+        if len(rects) > MAX_DIRTY_RECTS:
+            return None
+        if FrameBuffer.area(rects) > MAX_DIRTY_AREA * self.epd.width * self.epd.height:
+            return None
+
+        return rects
+
+    def _quantize(self, image):
+        palette = getattr(self.epd, "palette", None)
+        if palette is None:
+            return image
+
+        return Helper.quantize_frame(image, palette, image.info.get("dither", []))
+
+    def _wake(self):
+        self._cancel_idle_timer()
+        if self.power_state == POWER_AWAKE:
+            return
+
+        logger.debug("Waking e-Paper display")
+        self.epd.init()
+        self.power_state = POWER_AWAKE
+        self.metrics["wakes"] += 1
+
+    def _schedule_sleep(self):
+        if self.idle_timeout <= 0:
+            self._sleep()
+            return
+
+        self.idle_timer = threading.Timer(self.idle_timeout, self._sleep)
+        self.idle_timer.daemon = True
+        self.idle_timer.start()
+
+    def _cancel_idle_timer(self):
+        if self.idle_timer is not None:
+            self.idle_timer.cancel()
+            self.idle_timer = None
+
+    def _sleep(self):
+        with self.power_lock:
+            self._cancel_idle_timer()
+            if self.power_state != POWER_AWAKE:
+                return
+
+            logger.debug("Putting e-Paper display to sleep")
+            self.epd.sleep()
+            self.power_state = POWER_SLEEP
+
+    def _recover(self, error):
+        # BUSY never released, the panel contents are unknown and the
+        # controller is reset by init() on the next update
+        logger.error(f"e-Paper display timed out: {error}")
+        self.metrics["timeouts"] += 1
+        self._cancel_idle_timer()
+        try:
+            self.epd.sleep()
+        except Exception as e:
+            logger.warning(f"Failed to put e-Paper display to sleep: {e}")
+        self.power_state = POWER_SLEEP
+        self.last_buffer = None
+        self.last_digest = None
+
+    def get_metrics(self):
+        return dict(self.metrics)
+
     def cleanup(self):
         if self.epd is not None:
             logger.info("Cleaning up e-Paper display")
-            self.epd.init()
-            self.epd.Clear()
+            with self.power_lock:
+                try:
+                    self._wake()
+                    self.epd.Clear()
+                    self._sleep()
+                except TimeoutError as e:
+                    self._recover(e)
+                self.last_buffer = None
+                self.last_digest = None
@@ -0,0 +1,63 @@
+from PIL import Image, ImageChops
+
+DIFF_BAND = 16
+
+
+def _as_image(buffer, width, bits):
+    # View a packed framebuffer as an "L" image of its bytes, one row per line
+    row_bytes = (width * bits + 7) // 8
+    return Image.frombytes("L", (row_bytes, len(buffer) // row_bytes), bytes(buffer))
+
+
+def diff_buffers(previous, current, width, bits=4, band=DIFF_BAND):
+    if len(previous) != len(current):
+        raise ValueError("Framebuffers differ in size")
+
+    diff = ImageChops.difference(
+        _as_image(previous, width, bits), _as_image(current, width, bits)
+    )
+    if diff.getbbox() is None:
+        return []
+
+    # Changed bytes per horizontal band, then merge overlapping neighbours
+    rects = []
+    for top in range(0, diff.height, band):
+        bbox = diff.crop((0, top, diff.width, min(top + band, diff.height))).getbbox()
+        if bbox is None:
+            continue
+        rect = (bbox[0], top + bbox[1], bbox[2], top + bbox[3])
+        if rects and _touches(rects[-1], rect, band):
+            last = rects.pop()
+            rect = (
+                min(last[0], rect[0]),
+                last[1],
+                max(last[2], rect[2]),
+                rect[3],
+            )
+        rects.append(rect)
+
+    pixels_per_byte = 8 // bits
+    return [
+        (
+            x0 * pixels_per_byte,
+            y0,
+            min(x1 * pixels_per_byte, width),
+            y1,
+        )
+        for x0, y0, x1, y1 in rects
+    ]
+
+
+def _touches(upper, lower, band):
+    return lower[1] - upper[3] < band and upper[0] <= lower[2] and lower[0] <= upper[2]
+
+
+def crop_buffer(buffer, width, rect, bits=4):
+    # rect is in pixels and must be aligned to whole bytes
+    pixels_per_byte = 8 // bits
+    box = (rect[0] // pixels_per_byte, rect[1], -(-rect[2] // pixels_per_byte), rect[3])
+    return _as_image(buffer, width, bits).crop(box).tobytes()
+
+
+def area(rects):
+    return sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in rects)
@@ -0,0 +1,215 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+import src.default as Default
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("auto", "inotify", "poll")
+
+# inotify(7) event flags, directories are watched so editors that save
+# through a temporary file and rename are still seen
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+EVENT_HEADER = struct.Struct("iIII")
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        _libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+
+    return _libc
+
+
+def inotify_available():
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        return hasattr(_load_libc(), "inotify_init1")
+    except OSError:
+        return False
+
+
+def parse_events(data):
+    # Yields (wd, mask, name) from a read on the inotify descriptor
+    offset = 0
+    while offset + EVENT_HEADER.size <= len(data):
+        wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+        offset += EVENT_HEADER.size
+        name = data[offset : offset + length].rstrip(b"\0").decode()
+        offset += length
+        yield wd, mask, name
+
+
+class FileWatcher:
+    def __init__(
+        self,
+        paths,
+        callback,
+        backend="auto",
+        debounce=Default.WATCH_DEBOUNCE,
+        interval=Default.WATCH_INTERVAL,
+    ):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown watch backend: {backend}")
+        if backend == "auto":
+            backend = "inotify" if inotify_available() else "poll"
+        self.backend = backend
+        self.callback = callback
+        self.debounce = debounce
+        self.interval = interval
+
+        self.lock = threading.Lock()
+        self.paths = set()
+        self.thread = None
+        self.stopping = threading.Event()
+
+        # inotify state, the pipe wakes select() on stop
+        self.fd = None
+        self.watches = {}
+        self.pipe = None
+
+        # Polling state
+        self.signature = None
+
+        self.set_paths(paths)
+
+    def set_paths(self, paths):
+        with self.lock:
+            self.paths = {os.path.abspath(path) for path in paths}
+            self.signature = self._stat()
+            if self.fd is not None:
+                self._add_watches()
+
+    def start(self):
+        if self.thread is not None:
+            return
+        if self.backend == "inotify":
+            self.fd = _load_libc().inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if self.fd < 0:
+                error = ctypes.get_errno()
+                raise OSError(error, f"inotify_init1 failed: {os.strerror(error)}")
+            self.pipe = os.pipe()
+            with self.lock:
+                self._add_watches()
+
+        self.stopping.clear()
+        self.thread = threading.Thread(
+            target=self._run, name="file-watcher", daemon=True
+        )
+        self.thread.start()
+        logger.debug(f"Watching {len(self.paths)} file(s) with {self.backend}")
+
+    def stop(self, timeout=None):
+        if self.thread is None:
+            return
+        self.stopping.set()
+        if self.pipe is not None:
+            os.write(self.pipe[1], b"\0")
+        self.thread.join(timeout)
+        self.thread = None
+
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+            self.watches = {}
+        if self.pipe is not None:
+            for fd in self.pipe:
+                os.close(fd)
+            self.pipe = None
+
+    def _add_watches(self):
+        directories = {os.path.dirname(path) for path in self.paths}
+        for directory in directories - set(self.watches.values()):
+            wd = _load_libc().inotify_add_watch(
+                self.fd, os.fsencode(directory), WATCH_MASK
+            )
+            if wd < 0:
+                logger.error(
+                    f"Cannot watch {directory}: {os.strerror(ctypes.get_errno())}"
+                )
+                continue
+            self.watches[wd] = directory
+
+    def _run(self):
+        # Trailing edge debounce, every change pushes the deadline back so a
+        # burst of writes results in one callback once the file is quiet
+        pending = None
+        while not self.stopping.is_set():
+            timeout = self.interval
+            if pending is not None:
+                timeout = max(0, pending - time.monotonic())
+
+            if self._wait(timeout):
+                pending = time.monotonic() + self.debounce
+            elif pending is not None and time.monotonic() >= pending:
+                pending = None
+                try:
+                    self.callback()
+                except Exception as e:
+                    logger.error(f"Error handling file change: {e}")
+
+    def _wait(self, timeout):
+        if self.backend == "inotify":
+            return self._wait_inotify(timeout)
+
+        return self._wait_poll(timeout)
+
+    def _wait_inotify(self, timeout):
+        ready, _, _ = select.select([self.fd, self.pipe[0]], [], [], timeout)
+        if self.fd not in ready:
+            return False
+
+        changed = False
+        data = os.read(self.fd, 64 * 1024)
+        with self.lock:
+            for wd, mask, name in parse_events(data):
+                if mask & IN_Q_OVERFLOW:
+                    changed = True
+                elif wd in self.watches:
+                    changed |= os.path.join(self.watches[wd], name) in self.paths
+
+        return changed
+
+    def _wait_poll(self, timeout):
+        if self.stopping.wait(min(timeout, self.interval)):
+            return False
+
+        with self.lock:
+            signature = self._stat()
+            changed = signature != self.signature
+            self.signature = signature
+
+        return changed
+
+    def _stat(self):
+        signature = {}
+        for path in self.paths:
+            try:
+                stats = os.stat(path)
+                signature[path] = (stats.st_mtime_ns, stats.st_size)
+            except OSError:
+                signature[path] = None
+
+        return signature
@@ -1,9 +1,21 @@
 import json
 import datetime
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
 from PIL import Image, ImageDraw, ImageFont
 from src.palette import *
+import src.default as Default
+import src.text_layout as TextLayout
+import src.cache_owners as CacheOwners
+
+_font_cache = OrderedDict()
+_font_cache_lock = threading.Lock()
+_font_cache_stats = {"hits": 0, "misses": 0}
+_font_cache_owners = CacheOwners.OwnerTable(
+    _font_cache_lock, lambda key: _font_cache.pop(key, None)
+)
 
 
 def load_json(file_path):
@@ -34,15 +46,58 @@ def get_file_modified_time(file_path):
         raise RuntimeError(f"Error getting modified time for {file_path}: {e}")
 
 
-def load_font(font_path, font_size):
+def load_font(font_path, font_size, layout_engine=None):
     font_size = int(font_size)
+    key = (font_path, font_size, layout_engine)
+    with _font_cache_lock:
+        font = _font_cache.get(key)
+        if font is not None:
+            _font_cache.move_to_end(key)
+            _font_cache_owners.add(key)
+            _font_cache_stats["hits"] += 1
+            return font
+        _font_cache_stats["misses"] += 1
+
+    font = _load_font(font_path, font_size, layout_engine)
+
+    with _font_cache_lock:
+        _font_cache[key] = font
+        _font_cache.move_to_end(key)
+        _font_cache_owners.add(key)
+        while len(_font_cache) > Default.FONT_CACHE_SIZE:
+            _font_cache_owners.discard(_font_cache.popitem(last=False)[0])
+
+    return font
+
+
+def _load_font(font_path, font_size, layout_engine=None):
     try:
-        return ImageFont.truetype(font_path, font_size)
+        if layout_engine is None:
+            return ImageFont.truetype(font_path, font_size)
+        return ImageFont.truetype(font_path, font_size, layout_engine=layout_engine)
     except Exception as e:
         print(f"Error loading font '{font_path}': {e}")
         return ImageFont.load_default(size=font_size)
 
 
+def font_cache_info():
+    with _font_cache_lock:
+        return {
+            "hits": _font_cache_stats["hits"],
+            "misses": _font_cache_stats["misses"],
+            "size": len(_font_cache),
+            "maxsize": Default.FONT_CACHE_SIZE,
+        }
+
+
+def clear_font_cache():
+    with _font_cache_lock:
+        _font_cache.clear()
+        _font_cache_owners.clear()
+        _font_cache_stats["hits"] = 0
+        _font_cache_stats["misses"] = 0
+
+
 def position(bbox, width, height, spacing=0, location="center"):
     content_width = bbox[2] - bbox[0]
     content_height = bbox[3] - bbox[1]
@@ -56,35 +111,11 @@ def position(bbox, width, height, spacing=0, location="center"):
 
 
 def cut_text(text, font, max_width):
-    words = text.split(" ")
-    lines = []
-    current_line = ""
-
-    for word in words:
-        test_line = f"{current_line} {word}".strip()
-        if font.getbbox(test_line)[2] <= max_width:
-            current_line = test_line
-        else:
-            if current_line:
-                lines.append(current_line)
-            current_line = word
-
-    if current_line:
-        lines.append(current_line)
-
-    return "\n".join(lines)
+    return TextLayout.wrap(text, font, max_width)
 
 
 def truncate_text(text, font, max_width):
-    if font.getbbox(text)[2] <= max_width:
-        return text
-
-    ellipsis = "..."
-    while font.getbbox(text + ellipsis)[2] > max_width:
-        if not text:
-            return ""
-        text = text[:-1]
-    return text + ellipsis
+    return TextLayout.truncate(text, font, max_width)
 
 
 def fit_and_crop_picture(picture, target_size):
@@ -109,11 +140,23 @@ def fit_and_crop_picture(picture, target_size):
     return resized_picture
 
 
-def quantize_image(image, palette):
-    palette_colors = PALETTE.get(palette, PALETTE_6_COLORS)
-    palette_image = Image.new("P", (1, 1))
-    palette_image.putpalette(palette_colors)
-    return image.quantize(palette=palette_image, dither=Image.Dither.FLOYDSTEINBERG)
+def quantize_frame(image, palette, dither_regions=()):
+    palette_image = get_palette_image(palette)
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+
+    # Photo-only frames skip the nearest-colour pass entirely
+    if (0, 0, image.width, image.height) in dither_regions:
+        return image.quantize(palette=palette_image, dither=Image.Dither.FLOYDSTEINBERG)
+
+    frame = image.quantize(palette=palette_image, dither=Image.Dither.NONE)
+    for region in dither_regions:
+        dithered = image.crop(region).quantize(
+            palette=palette_image, dither=Image.Dither.FLOYDSTEINBERG
+        )
+        frame.paste(dithered, region[:2])
+
+    return frame
 
 
 def invalid_image(image, width, height, text="Invalid API Response", spacing=10):
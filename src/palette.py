@@ -1,8 +1,6 @@
-EPD_PALETTE_MAP = {
-    "epd7in3e": "6_colors",
-    "mock": "6_colors",
-}
+import functools
 
+from PIL import Image
 
 PALETTE_RED = 0x0000FF
 PALETTE_GREEN = 0x00FF00
@@ -40,6 +38,7 @@ PALETTE_6_COLOR_NAMES = [
     "blue",
     "yellow",
 ]
+# Four levels, in the index order of 2 bit grayscale controllers
 PALETTE_GRAY_COLORS = [
     0,
     0,
@@ -47,18 +46,37 @@ PALETTE_GRAY_COLORS = [
     85,
     85,
     85,
-    127,
-    127,
-    127,
-    191,
-    191,
-    191,
+    170,
+    170,
+    170,
     255,
     255,
     255,
 ]
 PALETTE_GRAY_COLORS.extend([0] * (256 - len(PALETTE_GRAY_COLORS)))
+PALETTE_MONO_COLORS = [
+    0,
+    0,
+    0,
+    255,
+    255,
+    255,
+]
+PALETTE_MONO_COLORS.extend([0] * (256 - len(PALETTE_MONO_COLORS)))
 PALETTE = {
     "6_colors": PALETTE_6_COLORS,
     "gray": PALETTE_GRAY_COLORS,
+    "mono": PALETTE_MONO_COLORS,
 }
+
+
+@functools.lru_cache(maxsize=8)
+def _palette_image(palette):
+    image = Image.new("P", (1, 1))
+    image.putpalette(palette)
+    return image
+
+
+def get_palette_image(palette):
+    # Shared "P" image used as the quantization target for a palette
+    return _palette_image(tuple(palette))
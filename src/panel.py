@@ -1,6 +1,14 @@
 from PIL import Image, ImageDraw, ImageFont
 
 import src.default as Default
+import src.cache_owners as CacheOwners
+
+
+def image_bytes(image):
+    if image is None:
+        return 0
+
+    return image.width * image.height * len(image.getbands())
 
 
 class Panel:
@@ -17,10 +25,49 @@ class Panel:
 
         # Quantization settings
         self.palette_name = settings.get("palette", "6_colors")
+        self.dither = settings.get("dither", False)
+        self.dither_regions = []
 
         # Refresh settings
         self.refresh = True
 
+        # Render cache settings
+        self.render_cache = settings.get("render_cache", True)
+        self.render_fingerprint = None
+        self.render_image = None
+        self.render_hits = 0
+        self.render_misses = 0
+        self.damage = []
+
+        # Fetch settings, the asyncio runtime fetches data in the background
+        # and _request only serves the cache while this is set
+        self.fetch_async = False
+
+        # Spec the loader built this panel from, compared on reload
+        self.spec = None
+
+        # Lifecycle state, see setup, suspend and teardown
+        self.active = False
+
+    def setup(self):
+        # Acquire what suspend released, drawing also works without it
+        self.active = True
+
+    def suspend(self):
+        # Release heavy resources, small data caches are kept. Fonts and
+        # text sprites only this panel drew with leave the shared caches
+        self.active = False
+        self.render_fingerprint = None
+        self.render_image = None
+        self.damage = []
+        CacheOwners.release(self)
+
+    def teardown(self):
+        self.suspend()
+
+    def memory_usage(self):
+        return image_bytes(self.render_image)
+
     def needs_refresh(self):
         current = self.refresh
         self.refresh = False
@@ -31,15 +78,60 @@ class Panel:
         self.width = width
         self.height = height
 
-    def draw(self):
-        image = Image.new("RGB", (self.width, self.height), Default.BACKGROUND_COLOR)
-        image = self._draw(image)
-        image = self._draw_border(image)
-        if self.DEBUG:
-            image = self._draw_debug(image)
+    def fingerprint(self):
+        return (
+            type(self).__name__,
+            self.width,
+            self.height,
+            self.palette_name,
+            self._fingerprint(),
+        )
+
+    def next_deadline(self, now):
+        return None
+
+    def get_fetch_interval(self):
+        return None
+
+    def get_fetch_deadline(self):
+        return None
 
+    async def fetch(self, session):
+        return False
+
+    def cache_stats(self):
+        return {"hits": self.render_hits, "misses": self.render_misses}
+
+    def draw(self):
+        fingerprint = self.fingerprint()
+        if self.render_cache and fingerprint == self.render_fingerprint:
+            self.render_hits += 1
+            self.damage = []
+            self.render_image.info["damage"] = self.damage
+            return self.render_image
+        self.render_misses += 1
+        self.damage = [(0, 0, self.width, self.height)]
+        self.dither_regions = [(0, 0, self.width, self.height)] if self.dither else []
+
+        with CacheOwners.owner(self):
+            image = self._new_canvas()
+            image = self._draw(image)
+            image = self._draw_border(image)
+            if self.DEBUG:
+                image = self._draw_debug(image)
+
+        image.info["damage"] = self.damage
+        image.info["dither"] = self.dither_regions
+        self.render_fingerprint = fingerprint
+        self.render_image = image
         return image
 
+    def _fingerprint(self):
+        return ()
+
+    def _new_canvas(self):
+        return Image.new("RGB", (self.width, self.height), Default.BACKGROUND_COLOR)
+
     def _draw(self, image):
         return image
 
@@ -0,0 +1,93 @@
+import logging
+from collections import OrderedDict
+
+import src.default as Default
+
+logger = logging.getLogger(__name__)
+
+
+class PanelPool:
+    def __init__(
+        self, budget=Default.PANEL_MEMORY_BUDGET, size=Default.PANEL_POOL_SIZE
+    ):
+        # Panels by id, least recently used first
+        self.panels = OrderedDict()
+        self.budget = budget * 1024 * 1024
+        self.size = size
+        self.stats = {"loads": 0, "suspends": 0, "evictions": 0}
+
+    def __contains__(self, panel_id):
+        return panel_id in self.panels
+
+    def __getitem__(self, panel_id):
+        return self.panels[panel_id]
+
+    def __setitem__(self, panel_id, panel):
+        self.panels[panel_id] = panel
+        self.panels.move_to_end(panel_id)
+
+    def __len__(self):
+        return len(self.panels)
+
+    def get(self, panel_id, default=None):
+        return self.panels.get(panel_id, default)
+
+    def items(self):
+        return list(self.panels.items())
+
+    def pop(self, panel_id):
+        return self.panels.pop(panel_id)
+
+    def load(self, panel_id, panel_spec, loader):
+        panel = self.panels.get(panel_id)
+        if panel is None:
+            panel = loader(panel_spec)
+            self.stats["loads"] += 1
+        self[panel_id] = panel
+        if not panel.active:
+            panel.setup()
+
+        return panel
+
+    def memory_usage(self):
+        return sum(panel.memory_usage() for panel in self.panels.values())
+
+    def trim(self, keep=()):
+        # Panels that are not scheduled soon are suspended least recently
+        # used first until the pool fits the budget, and beyond the pool
+        # size the least recently used ones are dropped altogether
+        idle = [panel_id for panel_id in self.panels if panel_id not in keep]
+
+        usage = self.memory_usage()
+        for panel_id in idle:
+            if usage <= self.budget:
+                break
+            panel = self.panels[panel_id]
+            if not panel.active:
+                continue
+
+            usage -= panel.memory_usage()
+            panel.suspend()
+            usage += panel.memory_usage()
+            self.stats["suspends"] += 1
+            logger.debug(f"Suspended panel {panel_id}")
+
+        for panel_id in idle[: max(0, len(self.panels) - self.size)]:
+            self.panels.pop(panel_id).teardown()
+            self.stats["evictions"] += 1
+            logger.debug(f"Evicted panel {panel_id}")
+
+        return usage
+
+    def clear(self):
+        for panel in self.panels.values():
+            panel.teardown()
+        self.panels.clear()
+
+    def get_stats(self):
+        return dict(
+            self.stats,
+            panels=len(self.panels),
+            active=sum(panel.active for panel in self.panels.values()),
+            memory=self.memory_usage(),
+        )
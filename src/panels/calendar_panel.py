@@ -1,8 +1,10 @@
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw
 from datetime import date, datetime, timedelta, time
 
 from src.panel import Panel
 import src.helper as Helper
+import src.text_layout as TextLayout
+import src.text_sprite as TextSprite
 from src.palette import *
 import src.default as Default
 
@@ -39,7 +41,23 @@ class CalendarPanel(Panel):
 
         return current
 
+    def next_deadline(self, now):
+        # The fingerprint holds today's date
+        return datetime.combine(now.date() + timedelta(days=1), time.min)
+
+    def get_fetch_interval(self):
+        return self.request_interval * 60 or Default.DURATION_REFRESH
+
+    def get_fetch_deadline(self):
+        return self.request_recent + timedelta(seconds=self.get_fetch_interval())
+
+    async def fetch(self, session):
+        events = await IcalAPI.get_events_async(session, self.ical_urls)
+        return self._update_cache(events)
+
     def _request(self):
+        if self.fetch_async:
+            return self.cache
         if (self.cache is not None) and (
             datetime.now() - self.request_recent
             < timedelta(minutes=self.request_interval)
@@ -47,16 +65,26 @@ class CalendarPanel(Panel):
             return self.cache
 
         events = IcalAPI.get_events(self.ical_urls)
-        if self.cache != events:
+        self._update_cache(events)
+
+        return self.cache
+
+    def _update_cache(self, events):
+        changed = self.cache != events
+        if changed:
             self.refresh = True
 
         if self.request_recent.date() < datetime.now().date():
+            changed = True
             self.refresh = True
 
         self.cache = events
         self.request_recent = datetime.now()
 
-        return self.cache
+        return changed
+
+    def _fingerprint(self):
+        return (date.today(), self._request())
 
     def _draw(self, image):
         draw = ImageDraw.Draw(image)
@@ -74,7 +102,7 @@ class CalendarPanel(Panel):
         current_month = None
         current_day = None
         current_week = None
-        event_spacing = font.getbbox("000")[2]
+        event_spacing = TextLayout.text_width("000", font)
         location = (spacing, spacing)
         displayed_events = []
         for event in events:
@@ -110,15 +138,13 @@ class CalendarPanel(Panel):
 
     def _draw_month(self, image, month, font, location, spacing):
         text = month.strftime("%Y %B")
-        bbox = ImageDraw.Draw(Image.new("RGB", (1, 1))).textbbox(
-            (0, 0), text, font=font
-        )
+        bbox = TextLayout.measure(text, font=font)
         position = (
             location[0] - bbox[0] + spacing,
             location[1] - bbox[1],
         )
-        draw = ImageDraw.Draw(image)
-        draw.text(
+        TextSprite.draw_text(
+            image,
             position,
             text,
             font=font,
@@ -128,15 +154,13 @@ class CalendarPanel(Panel):
 
     def _draw_week(self, image, week, font, location, spacing):
         text = f"Week {week}"
-        bbox = ImageDraw.Draw(Image.new("RGB", (1, 1))).textbbox(
-            (0, 0), text, font=font
-        )
+        bbox = TextLayout.measure(text, font=font)
         position = (
             location[0] - bbox[0] + spacing,
             location[1] - bbox[1],
         )
-        draw = ImageDraw.Draw(image)
-        draw.text(
+        TextSprite.draw_text(
+            image,
             position,
             text,
             font=font,
@@ -147,9 +171,7 @@ class CalendarPanel(Panel):
     def _draw_day(self, image, day, font, location):
         is_today = day.date() == date.today()
         text = day.strftime("%d")
-        bbox = ImageDraw.Draw(Image.new("RGB", (1, 1))).textbbox(
-            (0, 0), text, font=font
-        )
+        bbox = TextLayout.measure(text, font=font)
         position = (
             location[0] - bbox[0],
             location[1] - bbox[1],
@@ -166,7 +188,8 @@ class CalendarPanel(Panel):
                 fill=PALETTE_GREEN,
             )
         text_fill = "white" if is_today else "black"
-        draw.text(
+        TextSprite.draw_text(
+            image,
             position,
             text,
             font=font,
@@ -182,9 +205,7 @@ class CalendarPanel(Panel):
             text += (
                 f"\n{entry['start'].strftime('%H:%M')}-{entry['end'].strftime('%H:%M')}"
             )
-        bbox = ImageDraw.Draw(Image.new("RGB", (1, 1))).textbbox(
-            (0, 0), text, font=font
-        )
+        bbox = TextLayout.measure(text, font=font)
         position = (
             location[0] + spacing,
             location[1] - bbox[1],
@@ -211,7 +232,8 @@ class CalendarPanel(Panel):
             ],
             fill=fill_color,
         )
-        draw.text(
+        TextSprite.draw_text(
+            image,
             position,
             text,
             font=font,
@@ -0,0 +1,119 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from src.panel import Panel
+import src.default as Default
+
+EXECUTORS = (None, "thread")
+
+
+class CompositePanel(Panel):
+    def __init__(self, width=800, height=480, settings={}, DEBUG=False):
+        super().__init__(width, height, settings, DEBUG)
+
+        # Margin, padding and border settings
+        self.padding = settings.get("padding", Default.PADDING)
+
+        # Damage tracking settings
+        self.retained = False
+        self.retained_layout = None
+
+        # Executor settings
+        self.executor = settings.get("executor", None)
+        self.workers = settings.get("workers", None)
+        self.pool = None
+        if self.executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor: {self.executor}")
+
+    def get_panels(self):
+        return []
+
+    def setup(self):
+        super().setup()
+        for panel, _ in self.get_panels():
+            panel.setup()
+
+    def suspend(self):
+        super().suspend()
+        self.retained_layout = None
+        for panel, _ in self.get_panels():
+            panel.suspend()
+
+    def teardown(self):
+        super().teardown()
+        for panel, _ in self.get_panels():
+            panel.teardown()
+        self.shutdown_pool()
+
+    def shutdown_pool(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False)
+            self.pool = None
+
+    def memory_usage(self):
+        return super().memory_usage() + sum(
+            panel.memory_usage() for panel, _ in self.get_panels()
+        )
+
+    def next_deadline(self, now):
+        deadlines = [panel.next_deadline(now) for panel, _ in self.get_panels()]
+        deadlines = [deadline for deadline in deadlines if deadline is not None]
+
+        return min(deadlines, default=None)
+
+    def _get_layout(self):
+        return [(id(panel), position) for panel, position in self.get_panels()]
+
+    def _fingerprint(self):
+        return tuple(panel.fingerprint() for panel, _ in self.get_panels())
+
+    def _new_canvas(self):
+        self.retained = (
+            self.render_image is not None
+            and self.render_image.mode == "RGB"
+            and self.render_image.size == (self.width, self.height)
+            and self.retained_layout == self._get_layout()
+        )
+        if self.retained:
+            return self.render_image.copy()
+
+        return super()._new_canvas()
+
+    def _render_panels(self, panels):
+        if self.executor != "thread" or len(panels) < 2:
+            return [panel.draw() for panel in panels]
+
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(
+                max_workers=self.workers or len(panels),
+                thread_name_prefix=type(self).__name__,
+            )
+        futures = [self.pool.submit(panel.draw) for panel in panels]
+        return [future.result() for future in futures]
+
+    def _draw(self, image):
+        panels = self.get_panels()
+        panel_images = self._render_panels([panel for panel, _ in panels])
+
+        damage = []
+        self.dither_regions = []
+        for (panel, position), panel_image in zip(panels, panel_images):
+            self.dither_regions.extend(
+                self._offset(panel_image.info.get("dither", []), position)
+            )
+            if self.retained and not panel.damage:
+                continue
+
+            image.paste(panel_image, position)
+            damage.extend(self._offset(panel.damage, position))
+
+        if self.retained:
+            self.damage = damage
+        self.retained_layout = self._get_layout()
+
+        return super()._draw(image)
+
+    def _offset(self, rects, position):
+        return [
+            (x0 + position[0], y0 + position[1], x1 + position[0], y1 + position[1])
+            for x0, y0, x1, y1 in rects
+        ]
@@ -1,10 +1,8 @@
-from PIL import Image, ImageDraw, ImageFont
-
 from src.panel import Panel
-import src.default as Default
+from src.panels.layout_panel import LayoutPanel
 
 
-class FourPanel(Panel):
+class FourPanel(LayoutPanel):
     def __init__(
         self,
         width=800,
@@ -16,30 +14,14 @@ class FourPanel(Panel):
         panel3=None,
         panel4=None,
     ):
-        super().__init__(width, height, settings, DEBUG)
-
-        # Margin, padding and border settings
-        self.padding = settings.get("padding", Default.PADDING)
+        super().__init__(width, height, {**settings, "rows": 2, "columns": 2}, DEBUG)
 
+        self.panel1 = None
+        self.panel2 = None
+        self.panel3 = None
+        self.panel4 = None
         self.set_panels(panel1, panel2, panel3, panel4)
 
-    def needs_refresh(self):
-        current = super().needs_refresh()
-        current = (
-            isinstance(self.panel1, Panel) and self.panel1.needs_refresh()
-        ) or current
-        current = (
-            isinstance(self.panel2, Panel) and self.panel2.needs_refresh()
-        ) or current
-        current = (
-            isinstance(self.panel3, Panel) and self.panel3.needs_refresh()
-        ) or current
-        current = (
-            isinstance(self.panel4, Panel) and self.panel4.needs_refresh()
-        ) or current
-
-        return current
-
     def set_panels(
         self,
         panel1: Panel = None,
@@ -56,136 +38,4 @@ class FourPanel(Panel):
         if isinstance(panel4, Panel):
             self.panel4 = panel4
 
-        self._set_panel_size()
-        self._set_panel_palette()
-
-    def set_size(self, width, height):
-        super().set_size(width, height)
-        self._set_panel_size()
-
-    def get_panel_size(self):
-        return (
-            (self.width - self.margin * 2) // 2 - self.padding * 2,
-            (self.height - self.margin * 2) // 2 - self.padding * 2,
-        )
-
-    def _set_panel_size(self):
-        target_width, target_height = self.get_panel_size()
-        if isinstance(self.panel1, Panel):
-            self.panel1.set_size(target_width, target_height)
-        if isinstance(self.panel2, Panel):
-            self.panel2.set_size(target_width, target_height)
-        if isinstance(self.panel3, Panel):
-            self.panel3.set_size(target_width, target_height)
-        if isinstance(self.panel4, Panel):
-            self.panel4.set_size(target_width, target_height)
-
-    def _set_panel_palette(self):
-        if isinstance(self.panel1, Panel):
-            self.panel1.palette_name = self.palette_name
-        if isinstance(self.panel2, Panel):
-            self.panel2.palette_name = self.palette_name
-        if isinstance(self.panel3, Panel):
-            self.panel3.palette_name = self.palette_name
-        if isinstance(self.panel4, Panel):
-            self.panel4.palette_name = self.palette_name
-
-    def _draw(self, image):
-        spacing = self.margin + self.padding
-
-        if isinstance(self.panel1, Panel):
-            panel1_image = self.panel1.draw()
-            image.paste(panel1_image, (spacing, spacing))
-
-        if isinstance(self.panel2, Panel):
-            panel2_image = self.panel2.draw()
-            image.paste(panel2_image, (self.width // 2 + self.padding, spacing))
-
-        if isinstance(self.panel3, Panel):
-            panel3_image = self.panel3.draw()
-            image.paste(panel3_image, (spacing, self.height // 2 + self.padding))
-
-        if isinstance(self.panel4, Panel):
-            panel4_image = self.panel4.draw()
-            image.paste(
-                panel4_image,
-                (self.width // 2 + self.padding, self.height // 2 + self.padding),
-            )
-
-        return super()._draw(image)
-
-    def _draw_border(self, image):
-        draw = ImageDraw.Draw(image)
-
-        draw.line(
-            [
-                (self.width // 2, self.margin),
-                (self.width // 2, self.height - self.margin),
-            ],
-            fill=self.border_color,
-            width=self.border_width,
-        )
-
-        draw.line(
-            [
-                (self.margin, self.height // 2),
-                (self.width - self.margin, self.height // 2),
-            ],
-            fill=self.border_color,
-            width=self.border_width,
-        )
-
-        return super()._draw_border(image)
-
-    def _draw_debug(self, image):
-        draw = ImageDraw.Draw(image)
-
-        spacing = self.margin + self.padding
-        panel_width, panel_height = self.get_panel_size()
-
-        draw.rectangle(
-            [
-                (spacing, spacing),
-                (spacing + panel_width, spacing + panel_height),
-            ],
-            outline="blue",
-            width=2,
-        )
-
-        draw.rectangle(
-            [
-                (self.width // 2 + self.padding, spacing),
-                (
-                    self.width // 2 + self.padding + panel_width,
-                    spacing + panel_height,
-                ),
-            ],
-            outline="blue",
-            width=2,
-        )
-
-        draw.rectangle(
-            [
-                (spacing, self.height // 2 + self.padding),
-                (
-                    spacing + panel_width,
-                    self.height // 2 + self.padding + panel_height,
-                ),
-            ],
-            outline="blue",
-            width=2,
-        )
-
-        draw.rectangle(
-            [
-                (self.width // 2 + self.padding, self.height // 2 + self.padding),
-                (
-                    self.width // 2 + self.padding + panel_width,
-                    self.height // 2 + self.padding + panel_height,
-                ),
-            ],
-            outline="blue",
-            width=2,
-        )
-
-        return super()._draw_debug(image)
+        self.set_layout([self.panel1, self.panel2, self.panel3, self.panel4])
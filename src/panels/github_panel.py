@@ -17,6 +17,9 @@ class GithubPanel(Panel):
     def __init__(self, width, height, settings, DEBUG=False):
         super().__init__(width, height, settings, DEBUG)
 
+        # Quantization settings
+        self.dither = settings.get("dither", True)
+
         # GitHub API settings
         self.username = settings.get("username")
         self.github_token = settings.get("github_token", GITHUB_TOKEN)
@@ -39,7 +42,21 @@ class GithubPanel(Panel):
 
         return current
 
+    def get_fetch_interval(self):
+        return self.request_interval * 60 or Default.DURATION_REFRESH
+
+    def get_fetch_deadline(self):
+        return self.request_recent + timedelta(seconds=self.get_fetch_interval())
+
+    async def fetch(self, session):
+        contributions = await GithubAPI.get_github_contributions_async(
+            session, self.username, self.github_token
+        )
+        return self._update_cache(contributions)
+
     def _request(self):
+        if self.fetch_async:
+            return self.cache
         if (self.cache is not None) and (
             datetime.now() - self.request_recent
             < timedelta(minutes=self.request_interval)
@@ -49,13 +66,22 @@ class GithubPanel(Panel):
         contributions = GithubAPI.get_github_contributions(
             self.username, self.github_token
         )
-        if self.cache != contributions:
+        self._update_cache(contributions)
+
+        return self.cache
+
+    def _update_cache(self, contributions):
+        changed = self.cache != contributions
+        if changed:
             self.refresh = True
 
         self.cache = contributions
         self.request_recent = datetime.now()
 
-        return self.cache
+        return changed
+
+    def _fingerprint(self):
+        return (self._request(),)
 
     def _draw(self, image):
         draw = ImageDraw.Draw(image)
@@ -110,7 +136,7 @@ class GithubPanel(Panel):
             [(0, 0), (graph_location[0], self.height)],
             fill="white",
         )
-        return Helper.quantize_image(image, self.palette_name)
+        return image
 
     def _draw_api_invalid(self, image):
         return Helper.invalid_image(
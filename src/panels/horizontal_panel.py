@@ -1,10 +1,8 @@
-from PIL import Image, ImageDraw, ImageFont
-
 from src.panel import Panel
-import src.default as Default
+from src.panels.layout_panel import LayoutPanel
 
 
-class HorizontalPanel(Panel):
+class HorizontalPanel(LayoutPanel):
     def __init__(
         self,
         width=800,
@@ -14,24 +12,11 @@ class HorizontalPanel(Panel):
         panel1=None,
         panel2=None,
     ):
-        super().__init__(width, height, settings, DEBUG)
-
-        # Margin, padding and border settings
-        self.padding = settings.get("padding", Default.PADDING)
+        super().__init__(width, height, {**settings, "rows": 1, "columns": 2}, DEBUG)
 
+        self.panel1 = None
+        self.panel2 = None
         self.set_panels(panel1, panel2)
-        self._set_panel_palette()
-
-    def needs_refresh(self):
-        current = super().needs_refresh()
-        current = (
-            isinstance(self.panel1, Panel) and self.panel1.needs_refresh()
-        ) or current
-        current = (
-            isinstance(self.panel2, Panel) and self.panel2.needs_refresh()
-        ) or current
-
-        return current
 
     def set_panels(self, panel1: Panel = None, panel2: Panel = None):
         if isinstance(panel1, Panel):
@@ -39,84 +24,4 @@ class HorizontalPanel(Panel):
         if isinstance(panel2, Panel):
             self.panel2 = panel2
 
-        self._set_panel_size()
-
-    def set_size(self, width, height):
-        super().set_size(width, height)
-        self._set_panel_size()
-
-    def get_panel_size(self):
-        spacing = self.margin + self.padding
-        return (
-            (self.width - self.margin * 2) // 2 - self.padding * 2,
-            self.height - spacing * 2,
-        )
-
-    def _set_panel_size(self):
-        target_width, target_height = self.get_panel_size()
-        if isinstance(self.panel1, Panel):
-            self.panel1.set_size(target_width, target_height)
-        if isinstance(self.panel2, Panel):
-            self.panel2.set_size(target_width, target_height)
-
-    def _set_panel_palette(self):
-        if isinstance(self.panel1, Panel):
-            self.panel1.palette_name = self.palette_name
-        if isinstance(self.panel2, Panel):
-            self.panel2.palette_name = self.palette_name
-
-    def _draw(self, image):
-        spacing = self.margin + self.padding
-
-        if isinstance(self.panel1, Panel):
-            panel1_image = self.panel1.draw()
-            image.paste(panel1_image, (spacing, spacing))
-
-        if isinstance(self.panel2, Panel):
-            panel2_image = self.panel2.draw()
-            image.paste(panel2_image, (self.width // 2 + self.padding, spacing))
-
-        return super()._draw(image)
-
-    def _draw_border(self, image):
-        draw = ImageDraw.Draw(image)
-
-        draw.line(
-            [
-                (self.width // 2, self.margin),
-                (self.width // 2, self.height - self.margin),
-            ],
-            fill=self.border_color,
-            width=self.border_width,
-        )
-
-        return super()._draw_border(image)
-
-    def _draw_debug(self, image):
-        draw = ImageDraw.Draw(image)
-
-        spacing = self.margin + self.padding
-        panel_width, panel_height = self.get_panel_size()
-
-        draw.rectangle(
-            [
-                (spacing, spacing),
-                (spacing + panel_width, spacing + panel_height),
-            ],
-            outline="blue",
-            width=2,
-        )
-
-        draw.rectangle(
-            [
-                (self.width // 2 + self.padding, spacing),
-                (
-                    self.width // 2 + self.padding + panel_width,
-                    spacing + panel_height,
-                ),
-            ],
-            outline="blue",
-            width=2,
-        )
-
-        return super()._draw_debug(image)
+        self.set_layout([self.panel1, self.panel2])
@@ -0,0 +1,262 @@
+from PIL import ImageDraw
+
+from src.panel import Panel
+from src.panels.composite_panel import CompositePanel
+
+
+class LayoutPanel(CompositePanel):
+    def __init__(
+        self,
+        width=800,
+        height=480,
+        settings={},
+        DEBUG=False,
+        panels=None,
+        cells=None,
+    ):
+        super().__init__(width, height, settings, DEBUG)
+
+        # Layout settings
+        self.rows = settings.get("rows", None)
+        self.columns = settings.get("columns", None)
+
+        # Solved layout
+        self.spec_version = 0
+        self.table = []
+        self.separators = []
+        self.table_key = None
+
+        self.set_layout(panels or [], cells)
+
+    def needs_refresh(self):
+        current = super().needs_refresh()
+        for panel, _ in self.get_panels():
+            current = panel.needs_refresh() or current
+
+        return current
+
+    def set_layout(self, panels, cells=None):
+        self.panels = list(panels)
+        self.cells = list(cells or [])
+        self.cells += [{}] * (len(self.panels) - len(self.cells))
+        self.spec_version += 1
+        self._update_table()
+
+    def set_size(self, width, height):
+        super().set_size(width, height)
+        self._update_table()
+
+    def get_panels(self):
+        self._update_table()
+        return [(panel, (rect[0], rect[1])) for panel, rect in self.table]
+
+    def _get_spec_key(self):
+        return (
+            self.spec_version,
+            tuple(
+                panel._get_spec_key()
+                for panel in self.panels
+                if isinstance(panel, LayoutPanel)
+            ),
+        )
+
+    def _update_table(self):
+        key = (self.width, self.height, self.palette_name, self._get_spec_key())
+        if key == self.table_key:
+            return
+
+        table = []
+        separators = []
+        self._solve((0, 0, self.width, self.height), table, separators, False)
+
+        for panel, rect in table:
+            size = (rect[2] - rect[0], rect[3] - rect[1])
+            if (panel.width, panel.height) != size:
+                panel.set_size(*size)
+            panel.palette_name = self.palette_name
+
+        self.table = table
+        self.separators = separators
+        self.table_key = key
+
+    def _solve(self, box, table, separators, nested):
+        content = (
+            box[0] + self.margin,
+            box[1] + self.margin,
+            box[2] - self.margin,
+            box[3] - self.margin,
+        )
+        rows, columns = self._get_tracks()
+        ys = self._split(content[1], content[3], rows)
+        xs = self._split(content[0], content[2], columns)
+
+        occupied = {}
+        for index, (panel, cell, row, column, row_span, column_span) in enumerate(
+            self._place(len(rows), len(columns))
+        ):
+            for r in range(row, row + row_span):
+                for c in range(column, column + column_span):
+                    occupied[(r, c)] = index
+
+            if not isinstance(panel, Panel):
+                continue
+
+            padding = cell.get("padding", self.padding)
+            rect = (
+                xs[column] + padding,
+                ys[row] + padding,
+                xs[column + column_span] - padding,
+                ys[row + row_span] - padding,
+            )
+            if isinstance(panel, LayoutPanel):
+                panel._solve(rect, table, separators, True)
+            else:
+                table.append((panel, rect))
+
+        if self.border_width <= 0:
+            return
+
+        for r in range(len(rows)):
+            for c in range(1, len(columns)):
+                cell = occupied.get((r, c))
+                if cell is None or cell != occupied.get((r, c - 1)):
+                    separators.append(
+                        (
+                            "line",
+                            [(xs[c], ys[r]), (xs[c], ys[r + 1])],
+                            self.border_color,
+                            self.border_width,
+                        )
+                    )
+        for r in range(1, len(rows)):
+            for c in range(len(columns)):
+                cell = occupied.get((r, c))
+                if cell is None or cell != occupied.get((r - 1, c)):
+                    separators.append(
+                        (
+                            "line",
+                            [(xs[c], ys[r]), (xs[c + 1], ys[r])],
+                            self.border_color,
+                            self.border_width,
+                        )
+                    )
+
+        if nested:
+            separators.append(
+                (
+                    "rectangle",
+                    [(content[0], content[1]), (content[2], content[3])],
+                    self.border_color,
+                    self.border_width,
+                )
+            )
+
+    def _get_tracks(self):
+        count = max(len(self.panels), 1)
+        rows, columns = self.rows, self.columns
+        if rows is None and columns is None:
+            rows, columns = 1, count
+        elif rows is None:
+            columns = self._as_weights(columns)
+            rows = -(-count // len(columns))
+        elif columns is None:
+            rows = self._as_weights(rows)
+            columns = -(-count // len(rows))
+
+        return self._as_weights(rows), self._as_weights(columns)
+
+    def _as_weights(self, tracks):
+        if isinstance(tracks, int):
+            if tracks < 1:
+                raise ValueError(f"Invalid layout track count: {tracks}")
+            return [1] * tracks
+        if not tracks or any(weight <= 0 for weight in tracks):
+            raise ValueError(f"Invalid layout track weights: {tracks}")
+        return list(tracks)
+
+    def _split(self, start, end, weights):
+        total = sum(weights)
+        size = end - start
+        bounds = [start]
+        cumulative = 0
+        for weight in weights:
+            cumulative += weight
+            bounds.append(start + int(size * cumulative // total))
+
+        return bounds
+
+    def _place(self, rows, columns):
+        occupied = set()
+        placements = [None] * len(self.panels)
+
+        def fits(row, column, row_span, column_span):
+            if row < 0 or column < 0:
+                return False
+            if row + row_span > rows or column + column_span > columns:
+                return False
+            return all(
+                (r, c) not in occupied
+                for r in range(row, row + row_span)
+                for c in range(column, column + column_span)
+            )
+
+        def occupy(index, row, column, row_span, column_span):
+            occupied.update(
+                (r, c)
+                for r in range(row, row + row_span)
+                for c in range(column, column + column_span)
+            )
+            placements[index] = (
+                self.panels[index],
+                self.cells[index],
+                row,
+                column,
+                row_span,
+                column_span,
+            )
+
+        # Explicitly placed cells first, then fill the rest row by row
+        for index, cell in enumerate(self.cells):
+            if "row" not in cell and "column" not in cell:
+                continue
+            row, column = cell.get("row", 0), cell.get("column", 0)
+            row_span, column_span = cell.get("row_span", 1), cell.get("column_span", 1)
+            if not fits(row, column, row_span, column_span):
+                raise ValueError(f"Invalid layout cell: {cell}")
+            occupy(index, row, column, row_span, column_span)
+
+        cursor = 0
+        for index, cell in enumerate(self.cells):
+            if placements[index] is not None:
+                continue
+            row_span, column_span = cell.get("row_span", 1), cell.get("column_span", 1)
+            while cursor < rows * columns and not fits(
+                cursor // columns, cursor % columns, row_span, column_span
+            ):
+                cursor += 1
+            if cursor >= rows * columns:
+                raise ValueError("Layout has more panels than cells")
+            occupy(index, cursor // columns, cursor % columns, row_span, column_span)
+
+        return placements
+
+    def _draw_border(self, image):
+        draw = ImageDraw.Draw(image)
+        for shape, xy, color, width in self.separators:
+            if shape == "rectangle":
+                draw.rectangle(xy, outline=color, width=width)
+            else:
+                draw.line(xy, fill=color, width=width)
+
+        return super()._draw_border(image)
+
+    def _draw_debug(self, image):
+        draw = ImageDraw.Draw(image)
+        for _, rect in self.table:
+            draw.rectangle(
+                [(rect[0], rect[1]), (rect[2], rect[3])],
+                outline="blue",
+                width=2,
+            )
+
+        return super()._draw_debug(image)
@@ -1,5 +1,6 @@
 from src.panel import Panel
 
+from src.panels.layout_panel import LayoutPanel
 from src.panels.four_panel import FourPanel
 from src.panels.horizontal_panel import HorizontalPanel
 from src.panels.vertical_panel import VerticalPanel
@@ -12,10 +13,87 @@ from src.panels.calendar_panel import CalendarPanel
 from src.panels.github_panel import GithubPanel
 from src.panels.picture_time_panel import PictureTimePanel
 
+CONTAINER_TYPES = ("layout", "four", "horizontal", "vertical")
+
 
 def load_panel(panel_spec, DEBUG=False) -> Panel:
-    if panel_spec["type"] == "four":
-        inner_panels = [load_panel(spec, DEBUG=DEBUG) for spec in panel_spec["panels"]]
+    if panel_spec["type"] in CONTAINER_TYPES:
+        inner_panels = [
+            load_panel(spec, DEBUG=DEBUG) for spec in panel_spec.get("panels", [])
+        ]
+        panel = _load_container(panel_spec, inner_panels, DEBUG)
+    else:
+        panel = _load_leaf(panel_spec, DEBUG)
+
+    panel.spec = panel_spec
+    return panel
+
+
+def reload_panel(panel, panel_spec, DEBUG=False) -> Panel:
+    if panel is not None and panel.spec == panel_spec:
+        return panel
+    # Only a loaded container that stays a container hands over children,
+    # anything else is replaced as a whole
+    container = (
+        panel_spec["type"] in CONTAINER_TYPES
+        and isinstance(panel, LayoutPanel)
+        and panel.spec is not None
+    )
+    if panel is not None and not container:
+        panel.teardown()
+    if panel_spec["type"] not in CONTAINER_TYPES:
+        return load_panel(panel_spec, DEBUG=DEBUG)
+
+    # Children are matched by spec first and by position second, so
+    # unchanged subtrees keep their instances, data caches and rendered tiles
+    old_panels = []
+    if container:
+        old_panels = panel.panels[: len(panel.spec.get("panels", []))]
+    unused = list(old_panels)
+
+    inner_specs = panel_spec.get("panels", [])
+    inner_panels = [None] * len(inner_specs)
+    for index, spec in enumerate(inner_specs):
+        for old in unused:
+            if old.spec == spec:
+                inner_panels[index] = old
+                unused.remove(old)
+                break
+
+    for index, spec in enumerate(inner_specs):
+        if inner_panels[index] is not None:
+            continue
+        if index < len(old_panels) and old_panels[index] in unused:
+            unused.remove(old_panels[index])
+            inner_panels[index] = reload_panel(old_panels[index], spec, DEBUG=DEBUG)
+        else:
+            inner_panels[index] = load_panel(spec, DEBUG=DEBUG)
+
+    # The replaced container releases its own pool and the children that
+    # were not handed over, reused children live on in the new container
+    if container:
+        for old in panel.panels:
+            if old is not None and (old in unused or old not in old_panels):
+                old.teardown()
+        panel.shutdown_pool()
+
+    panel = _load_container(panel_spec, inner_panels, DEBUG)
+    panel.spec = panel_spec
+    return panel
+
+
+def _load_container(panel_spec, inner_panels, DEBUG=False) -> Panel:
+    if panel_spec["type"] == "layout":
+        return LayoutPanel(
+            width=panel_spec.get("width", 0),
+            height=panel_spec.get("height", 0),
+            settings=panel_spec.get("settings", {}),
+            panels=inner_panels,
+            cells=[spec.get("cell", {}) for spec in panel_spec.get("panels", [])],
+            DEBUG=DEBUG,
+        )
+
+    elif panel_spec["type"] == "four":
         inner_panels += [None] * (4 - len(inner_panels))
         return FourPanel(
             width=panel_spec.get("width", 0),
@@ -29,7 +107,6 @@ def load_panel(panel_spec, DEBUG=False) -> Panel:
         )
 
     elif panel_spec["type"] == "horizontal":
-        inner_panels = [load_panel(spec, DEBUG=DEBUG) for spec in panel_spec["panels"]]
         inner_panels += [None] * (2 - len(inner_panels))
         return HorizontalPanel(
             width=panel_spec.get("width", 0),
@@ -41,7 +118,6 @@ def load_panel(panel_spec, DEBUG=False) -> Panel:
         )
 
     elif panel_spec["type"] == "vertical":
-        inner_panels = [load_panel(spec, DEBUG=DEBUG) for spec in panel_spec["panels"]]
         inner_panels += [None] * (2 - len(inner_panels))
         return VerticalPanel(
             width=panel_spec.get("width", 0),
@@ -52,6 +128,8 @@ def load_panel(panel_spec, DEBUG=False) -> Panel:
             DEBUG=DEBUG,
         )
 
+
+def _load_leaf(panel_spec, DEBUG=False) -> Panel:
     panel_classes = {
         "text": TextPanel,
         "time": TimePanel,
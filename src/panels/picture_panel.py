@@ -1,17 +1,22 @@
 import logging
 from PIL import Image, ImageDraw, ImageFont
 
-from src.panel import Panel
+from src.panel import Panel, image_bytes
 import src.helper as Helper
 
-
 logger = logging.getLogger(__name__)
 
 
 class PicturePanel(Panel):
     def __init__(self, width, height, settings=None, DEBUG=False):
         super().__init__(width, height, settings, DEBUG)
+
+        # Quantization settings
+        self.dither = settings.get("dither", True)
+
         self.picture = None
+        self.picture_path = None
+        self.picture_version = 0
         if settings and "picture" in settings:
             self.set_picture(settings["picture"])
 
@@ -24,15 +29,42 @@ class PicturePanel(Panel):
 
         return current
 
+    def setup(self):
+        super().setup()
+        if self.picture is None:
+            self._load_picture()
+
+    def suspend(self):
+        # The decoded picture is the heavy part, it is decoded again on use
+        super().suspend()
+        if self.picture_path is not None:
+            self.picture = None
+
+    def memory_usage(self):
+        return super().memory_usage() + image_bytes(self.picture)
+
     def set_picture(self, picture_path):
+        self.picture_path = picture_path
+        self.picture = None
+        self._load_picture()
+
+        self.picture_version += 1
+        self.refresh = True
+
+    def _load_picture(self):
+        if self.picture_path is None:
+            return
         try:
-            self.picture = Image.open(picture_path).convert("RGB")
+            self.picture = Image.open(self.picture_path).convert("RGB")
         except Exception as e:
             logger.error(f"Error loading picture: {e}")
 
-        self.refresh = True
+    def _fingerprint(self):
+        return (self.picture_version,)
 
     def _draw(self, image):
+        if self.picture is None:
+            self._load_picture()
         if not self.picture:
             logger.warning("Picture not set.")
             return super()._draw(image)
@@ -45,7 +77,6 @@ class PicturePanel(Panel):
         )
 
         picture = Helper.fit_and_crop_picture(self.picture, content_size)
-        picture = Helper.quantize_image(picture, self.palette_name)
 
         image.paste(picture, (self.margin, self.margin))
         return super()._draw(image)
@@ -7,11 +7,28 @@ class PictureTimePanel(TimePanel):
         super().__init__(width, height, settings, DEBUG)
         self.picture_panel = PicturePanel(width, height, settings, DEBUG)
 
+        # Quantization settings
+        self.dither = self.picture_panel.dither
+
     def needs_refresh(self):
         current = super().needs_refresh()
         current = self.picture_panel.needs_refresh() or current
         return current
 
+    def setup(self):
+        super().setup()
+        self.picture_panel.setup()
+
+    def suspend(self):
+        super().suspend()
+        self.picture_panel.suspend()
+
+    def memory_usage(self):
+        return super().memory_usage() + self.picture_panel.memory_usage()
+
+    def _fingerprint(self):
+        return super()._fingerprint() + self.picture_panel._fingerprint()
+
     def _draw(self, image):
         self.picture_panel._draw(image)
         return super()._draw(image)
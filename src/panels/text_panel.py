@@ -1,7 +1,9 @@
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw
 
 from src.panel import Panel
 import src.helper as Helper
+import src.text_layout as TextLayout
+import src.text_sprite as TextSprite
 import src.default as Default
 
 
@@ -47,9 +49,7 @@ class TextPanel(Panel):
 
         font = Helper.load_font(self.font, self.font_size)
         self.draw_text = Helper.cut_text(self.text, font, self.width - self.spacing * 2)
-        self.bbox = ImageDraw.Draw(Image.new("RGB", (1, 1))).textbbox(
-            (0, 0), self.draw_text, font=font, align=self.align
-        )
+        self.bbox = TextLayout.measure(self.draw_text, font=font, align=self.align)
         self.position = Helper.position(
             self.bbox,
             self.width,
@@ -62,8 +62,10 @@ class TextPanel(Panel):
             self.position[1] - self.bbox[1],
         )
 
+    def _fingerprint(self):
+        return (self.text,)
+
     def _draw(self, image):
-        draw = ImageDraw.Draw(image)
         font = Helper.load_font(self.font, self.font_size)
 
         if self.outline_color:
@@ -74,7 +76,8 @@ class TextPanel(Panel):
                 (-outline_size, outline_size),
                 (outline_size, -outline_size),
             ]:
-                draw.text(
+                TextSprite.draw_text(
+                    image,
                     (self.position[0] + dx, self.position[1] + dy),
                     self.draw_text,
                     fill=self.outline_color,
@@ -82,7 +85,8 @@ class TextPanel(Panel):
                     align=self.align,
                 )
 
-        draw.text(
+        TextSprite.draw_text(
+            image,
             self.position,
             self.draw_text,
             fill=self.font_color,
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from PIL import Image, ImageDraw, ImageFont
 
 from src.panels.text_panel import TextPanel
@@ -13,9 +13,20 @@ class TimePanel(TextPanel):
 
         return True
 
+    def next_deadline(self, now):
+        return (now + timedelta(minutes=1)).replace(second=0, microsecond=0)
+
+    def _fingerprint(self):
+        self._update_time()
+        return super()._fingerprint()
+
     def _draw(self, image):
+        self._update_time()
+        return super()._draw(image)
+
+    def _update_time(self):
         current_date = datetime.now().strftime("%Y-%m-%d")
         current_time = datetime.now().strftime("%H:%M")
-        self.update_text(f"{current_date}\n{current_time}")
-
-        return super()._draw(image)
+        text = f"{current_date}\n{current_time}"
+        if text != self.text:
+            self.update_text(text)
@@ -1,10 +1,12 @@
 import os
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw
 from datetime import datetime, timezone, timedelta
 
 from src.panel import Panel
 import src.helper as Helper
+import src.text_layout as TextLayout
+import src.text_sprite as TextSprite
 from src.palette import *
 import src.default as Default
 
@@ -21,15 +23,20 @@ class TogglPanel(Panel):
         self.font = settings.get("font", Default.FONT_EMOJI)
         self.font_size = Default.FONT_SIZE["H1"] / 480 * self.height
 
-        # Toggl API settings
+        # Quantization settings
+        self.dither = settings.get("dither", True)
+
+        # Toggl API settings, the key is verified by the first request
         self.auth = f"{settings.get('api_key', TOGGL_API_KEY)}:api_token"
-        self.api_key_status = TogglAPI.verify_api_key(self.auth)
+        self.api_key_status = None
+        self.api_key_verified = False
 
         # Margin, padding and border settings
         self.padding = settings.get("padding", Default.PADDING)
 
-        # Toggl Data
-        self.projects = TogglAPI.get_workspace_projects(self.auth, self.api_key_status)
+        # Toggl Data, the version changes with any project name or color
+        self.projects = {}
+        self.projects_version = 0
 
         # Request settings
         self.request_interval = settings.get("request_interval", 0)
@@ -48,11 +55,50 @@ class TogglPanel(Panel):
 
         return current
 
+    def suspend(self):
+        super().suspend()
+        self.debug_boxes = []
+
     def set_size(self, width, height):
         super().set_size(width, height)
         self.font_size = 96 / 480 * self.height
 
+    def get_fetch_interval(self):
+        return self.request_interval * 60 or Default.DURATION_REFRESH
+
+    def get_fetch_deadline(self):
+        return self.request_recent + timedelta(seconds=self.get_fetch_interval())
+
+    async def fetch(self, session):
+        changed = False
+        if not self.api_key_verified:
+            changed = self._update_api_key(
+                await TogglAPI.verify_api_key_async(session, self.auth)
+            )
+        if not self.api_key_status:
+            return changed
+
+        time_entries = await TogglAPI.get_time_entries_async(
+            session,
+            self.auth,
+            (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d"),
+        )
+        for workspace_id in self._get_missing_workspaces(time_entries):
+            changed |= self._update_projects(
+                await TogglAPI.get_workspace_projects_async(
+                    session, self.auth, workspace_id
+                )
+            )
+
+        return self._update_cache(time_entries) or changed
+
     def _request(self):
+        if self.fetch_async:
+            return self.cache
+        if not self.api_key_verified:
+            self._update_api_key(TogglAPI.verify_api_key(self.auth))
+        if not self.api_key_status:
+            return self.cache
         if (self.cache is not None) and (
             datetime.now() - self.request_recent
             < timedelta(minutes=self.request_interval)
@@ -62,38 +108,83 @@ class TogglPanel(Panel):
         time_entries = TogglAPI.get_time_entries(
             self.auth, (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
         )
-        if self.cache != time_entries:
+        for workspace_id in self._get_missing_workspaces(time_entries):
+            self._update_projects(
+                TogglAPI.get_workspace_projects(self.auth, workspace_id)
+            )
+        self._update_cache(time_entries)
+
+        return self.cache
+
+    def _update_api_key(self, api_key_status):
+        self.api_key_verified = True
+        self.api_key_status = api_key_status
+        self.refresh = True
+
+        return True
+
+    def _get_missing_workspaces(self, time_entries):
+        # Projects are looked up per workspace, the default one first
+        workspaces = set()
+        if not self.projects:
+            workspaces.add(self.api_key_status)
+        for entry in time_entries or []:
+            project_id = entry.get("project_id")
+            if project_id and project_id not in self.projects:
+                workspaces.add(entry.get("workspace_id") or self.api_key_status)
+
+        return workspaces
+
+    def _update_projects(self, projects):
+        changed = any(
+            self.projects.get(key) != value for key, value in projects.items()
+        )
+        if changed:
+            self.projects.update(projects)
+            self.projects_version += 1
+            self.refresh = True
+
+        return changed
+
+    def _update_cache(self, time_entries):
+        changed = self.cache != time_entries
+        if changed:
             self.refresh = True
 
         self.cache = time_entries
         self.request_recent = datetime.now()
 
-        return self.cache
+        return changed
+
+    def _fingerprint(self):
+        time_entries = self._request()
+        if not self.api_key_status:
+            return (self.api_key_verified, None)
+
+        return (time_entries, self.projects_version)
 
     def _draw(self, image):
+        self.debug_boxes = []
+        self._request()
+        if not self.api_key_verified:
+            return super()._draw(image)
         if not self.api_key_status:
             image = self._draw_api_invalid(image)
             return image
 
-        time_entries = self._request()
-        current_entry = time_entries[0]
+        time_entries = self._request() or []
+        current_entry = time_entries[0] if time_entries else None
         image = self._draw_current_entry(image, current_entry)
         image = self._draw_summary(image, time_entries)
 
-        image = Helper.quantize_image(image, self.palette_name)
-
         return super()._draw(image)
 
-    def _get_project_details(self, project_id, workspace_id=None):
+    def _get_project_details(self, project_id):
+        # Projects are fetched with the time entries, drawing never requests
         if not project_id:
-            return None
-        if project_id in self.projects:
-            return self.projects[project_id]
+            return {}
 
-        if workspace_id is None:
-            return None
-        self.projects = TogglAPI.get_workspace_projects(self.auth, workspace_id)
-        return self.projects.get(project_id, None)
+        return self.projects.get(project_id, {})
 
     def _draw_current_entry(self, image, entry):
         draw = ImageDraw.Draw(image)
@@ -113,12 +204,12 @@ class TogglPanel(Panel):
                 text_description, font, content_width
             )
         # Draw content
-        bbox = ImageDraw.Draw(Image.new("RGB", (1, 1))).textbbox(
-            (0, 0), text_description, font=font, align="left"
-        )
+        bbox = TextLayout.measure(text_description, font=font, align="left")
         position = Helper.position(bbox, content_width, content_height / 4, spacing)
         position = (spacing, position[1] - bbox[1] + spacing)
-        draw.text(position, text_description, fill="black", font=font, align="left")
+        TextSprite.draw_text(
+            image, position, text_description, fill="black", font=font, align="left"
+        )
         self.debug_boxes.append((position, bbox))
 
         if not entry:
@@ -129,16 +220,12 @@ class TogglPanel(Panel):
         text_project = ""
         color_project = "#000000"
         if entry.get("project_id"):
-            current_project = self._get_project_details(
-                entry.get("project_id"), entry.get("workspace_id")
-            )
+            current_project = self._get_project_details(entry.get("project_id"))
             text_project = current_project.get("name", "")
             color_project = current_project.get("color", "#000000")
         # Draw content
         font = Helper.load_font(self.font, self.font_size * 0.8)
-        bbox = ImageDraw.Draw(Image.new("RGB", (1, 1))).textbbox(
-            (0, 0), text_project, font=font, align="left"
-        )
+        bbox = TextLayout.measure(text_project, font=font, align="left")
         position = Helper.position(bbox, content_width, content_height / 4, spacing)
         position = (spacing, position[1] - bbox[1] + spacing + content_height / 4)
         draw.circle(
@@ -156,7 +243,8 @@ class TogglPanel(Panel):
             )
         )
         position = (position[0] + (bbox[3] - bbox[1]), position[1])
-        draw.text(
+        TextSprite.draw_text(
+            image,
             position,
             text_project,
             fill="black",
@@ -180,9 +268,7 @@ class TogglPanel(Panel):
         # Draw content
         ## From
         font = Helper.load_font(self.font, self.font_size * 0.6)
-        bbox_from = ImageDraw.Draw(Image.new("RGB", (1, 1))).textbbox(
-            (0, 0), "From: ", font=font, align="left"
-        )
+        bbox_from = TextLayout.measure("From: ", font=font, align="left")
         position_from = Helper.position(
             bbox_from, content_width, content_height / 6, spacing
         )
@@ -190,12 +276,12 @@ class TogglPanel(Panel):
             spacing,
             content_height / 2 + position_from[1] - bbox_from[1] + spacing,
         )
-        draw.text(position_from, "From: ", fill="black", font=font, align="left")
+        TextSprite.draw_text(
+            image, position_from, "From: ", fill="black", font=font, align="left"
+        )
         self.debug_boxes.append((position_from, bbox_from))
         ## Start time
-        bbox_start = ImageDraw.Draw(Image.new("RGB", (1, 1))).textbbox(
-            (0, 0), text_start, font=font, align="left"
-        )
+        bbox_start = TextLayout.measure(text_start, font=font, align="left")
         position_start = Helper.position(
             bbox_start, content_width, content_height / 6, spacing
         )
@@ -203,12 +289,12 @@ class TogglPanel(Panel):
             spacing + bbox_from[2] - bbox_from[0],
             content_height / 2 + position_start[1] - bbox_start[1] + spacing,
         )
-        draw.text(position_start, text_start, fill="black", font=font, align="left")
+        TextSprite.draw_text(
+            image, position_start, text_start, fill="black", font=font, align="left"
+        )
         self.debug_boxes.append((position_start, bbox_start))
         ## To
-        bbox_to = ImageDraw.Draw(Image.new("RGB", (1, 1))).textbbox(
-            (0, 0), "To: ", font=font, align="left"
-        )
+        bbox_to = TextLayout.measure("To: ", font=font, align="left")
         position_to = Helper.position(
             bbox_to, content_width, content_height / 4, spacing
         )
@@ -216,12 +302,12 @@ class TogglPanel(Panel):
             spacing,
             content_height / 3 * 2 + position_to[1] - bbox_to[1] + spacing,
         )
-        draw.text(position_to, "To: ", fill="black", font=font, align="left")
+        TextSprite.draw_text(
+            image, position_to, "To: ", fill="black", font=font, align="left"
+        )
         self.debug_boxes.append((position_to, bbox_to))
         ## End time
-        bbox_end = ImageDraw.Draw(Image.new("RGB", (1, 1))).textbbox(
-            (0, 0), text_end, font=font, align="left"
-        )
+        bbox_end = TextLayout.measure(text_end, font=font, align="left")
         position_end = Helper.position(
             bbox_end, content_width, content_height / 4, spacing
         )
@@ -229,7 +315,9 @@ class TogglPanel(Panel):
             spacing + bbox_from[2] - bbox_from[0],
             content_height / 3 * 2 + position_end[1] - bbox_end[1] + spacing,
         )
-        draw.text(position_end, text_end, fill="black", font=font, align="left")
+        TextSprite.draw_text(
+            image, position_end, text_end, fill="black", font=font, align="left"
+        )
         self.debug_boxes.append((position_end, bbox_end))
 
         return image
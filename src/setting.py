@@ -1,13 +1,24 @@
 import logging
 
 import src.helper as Helper
-from src.palette import EPD_PALETTE_MAP
+from src.display import drivers as Drivers
 import src.default as Default
 
 from datetime import datetime, timezone, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Attributes replaced together by a reload
+STATE_KEYS = (
+    "settings",
+    "setting_update",
+    "schedule",
+    "schedule_length",
+    "bedtime",
+    "panels",
+    "panels_update",
+)
+
 
 class Setting:
     def __init__(self, settings_file=Default.SETTINGS_FILE):
@@ -23,18 +34,71 @@ class Setting:
         # Initialize current panel index
         self.current_panel_index = 0
 
+        # Reload settings, a file watcher pushes reloads instead of
+        # get_next_panel polling the modification times
+        self.epd = None
+        self.watching = False
+
     def _update(self):
         settings_mod_time = Helper.get_file_modified_time(self.settings_file)
-        if settings_mod_time != self.setting_update:
-            logger.info("Settings file updated, reloading")
-            self._load_settings(self.settings_file)
-            self._load_schedule()
-
         panel_spec = self.settings.get("panel_spec", Default.PANEL_SPEC_FILE)
         panel_mod_time = Helper.get_file_modified_time(panel_spec)
-        if panel_mod_time != self.panels_update:
-            logger.info("Panel spec file updated, reloading")
-            self._load_panels()
+        if (settings_mod_time, panel_mod_time) != (
+            self.setting_update,
+            self.panels_update,
+        ):
+            logger.info("Settings or panel spec file updated, reloading")
+            self.reload()
+
+    def reload(self):
+        # Both files are parsed and verified on a staging instance before
+        # anything is replaced, a file that fails keeps the last good
+        # configuration
+        staged = object.__new__(Setting)
+        try:
+            staged._load_settings(self.settings_file)
+            staged._load_schedule()
+            staged._load_panels()
+            if self.epd is not None:
+                staged.set_epd_settings(self.epd)
+        except (ValueError, RuntimeError) as e:
+            logger.error(f"Failed to reload settings, keeping the last good configuration: {e}")
+            return False
+
+        self._set_state(staged._get_state())
+        self.current_panel_index %= self.schedule_length
+
+        return True
+
+    def _get_state(self):
+        return {key: getattr(self, key) for key in STATE_KEYS}
+
+    def _set_state(self, state):
+        # A single dict update, the render thread sees either the old or
+        # the new configuration but never a mix of both
+        self.__dict__.update(state)
+
+    def get_upcoming_panels(self, count=Default.PANEL_LOOKAHEAD):
+        schedule = self.schedule
+        return {
+            schedule[(self.current_panel_index + offset) % len(schedule)].get("id", 0)
+            for offset in range(count)
+        }
+
+    def get_panel_memory_budget(self):
+        return self.settings.get("panel_memory_budget", Default.PANEL_MEMORY_BUDGET)
+
+    def get_panel_pool_size(self):
+        return self.settings.get("panel_pool_size", Default.PANEL_POOL_SIZE)
+
+    def get_watch_paths(self):
+        return [
+            self.settings_file,
+            self.settings.get("panel_spec", Default.PANEL_SPEC_FILE),
+        ]
+
+    def get_watch_backend(self):
+        return self.settings.get("watch", Default.WATCH_BACKEND)
 
     def _load_settings(self, settings_file):
         logger.debug(f"Loading settings from {settings_file}")
@@ -82,20 +146,19 @@ class Setting:
                 )
 
     def set_epd_settings(self, epd):
+        self.epd = epd
         for panel in self.panels:
             panel["width"] = epd.width
             panel["height"] = epd.height
 
-        epd_name = self.get_epd_name()
-        palette = EPD_PALETTE_MAP.get(epd_name, None)
-        if palette is None:
-            raise ValueError(f"Unsupported e-Paper display: {epd_name}")
+        palette = Drivers.get_driver(self.get_epd_name())["palette"]
 
         for panel in self.panels:
             panel["settings"]["palette"] = palette
 
     def get_next_panel(self):
-        self._update()
+        if not self.watching:
+            self._update()
         if self.is_bedtime():
             logger.info("Starting bedtime mode")
             bedtime_panel = self.bedtime.get("id", 0)
@@ -110,12 +173,31 @@ class Setting:
 
         return panel_id, self.panels[panel_id], panel_duration
 
+    def peek_next_panel(self, at=None):
+        # What get_next_panel will return at the given time, without
+        # advancing the schedule
+        if self.is_bedtime(at):
+            bedtime_panel = self.bedtime.get("id", 0)
+            return bedtime_panel, self.panels[bedtime_panel]
+
+        panel_id = self.schedule[self.current_panel_index].get("id", 0)
+        return panel_id, self.panels[panel_id]
+
+    def get_prewarm_lead(self):
+        return self.settings.get("prewarm", Default.PREWARM_LEAD)
+
     def get_refresh_interval(self):
         return self.settings.get("refresh", Default.DURATION_REFRESH)
 
     def get_epd_name(self):
         return self.settings.get("epd", "mock")
 
+    def get_epd_backend(self):
+        return self.settings.get("epd_backend", None)
+
+    def get_epd_idle_timeout(self):
+        return self.settings.get("epd_idle_timeout", Default.EPD_IDLE_TIMEOUT)
+
     def get_panel_duration(self, current_panel_spec):
         duration = current_panel_spec.get("duration", Default.DURATION_PANEL) * 60
 
@@ -136,11 +218,20 @@ class Setting:
 
         return duration
 
-    def is_bedtime(self):
+    def get_bedtime_deadline(self, now):
+        if not self.bedtime:
+            return None
+
+        start_time = self._parse_time(self.bedtime["start"])
+        end_time = self._parse_time(self.bedtime["end"])
+
+        return min(self._next_datetime(start_time, now), self._next_datetime(end_time, now))
+
+    def is_bedtime(self, now=None):
         if not self.bedtime:
             return False
 
-        now = datetime.now()
+        now = now or datetime.now()
         start_time = self._parse_time(self.bedtime["start"])
         end_time = self._parse_time(self.bedtime["end"])
 
@@ -156,6 +247,13 @@ class Setting:
             logger.error(f"Invalid time format: {time_str}. Expected format is HH:MM.")
             return None
 
+    def _next_datetime(self, time, now):
+        target_time = datetime.combine(now.date(), time)
+        if target_time <= now:
+            target_time += timedelta(days=1)
+
+        return target_time
+
     def _calculate_duration(self, time):
         now = datetime.now()
         target_time = datetime.combine(now.date(), time)
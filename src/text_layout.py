@@ -0,0 +1,151 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+from PIL import Image, ImageDraw
+
+import src.default as Default
+
+_measure_draw = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+_caches = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _cached(font, key, compute):
+    with _lock:
+        cache = _caches.get(font)
+        if cache is None:
+            cache = OrderedDict()
+            _caches[font] = cache
+        elif key in cache:
+            cache.move_to_end(key)
+            _stats["hits"] += 1
+            return cache[key]
+        _stats["misses"] += 1
+
+    value = compute()
+
+    with _lock:
+        cache[key] = value
+        while len(cache) > Default.TEXT_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    return value
+
+
+def measure(text, font, align="left"):
+    return _cached(
+        font,
+        ("bbox", text, align),
+        lambda: _measure_draw.textbbox((0, 0), text, font=font, align=align),
+    )
+
+
+def text_width(text, font):
+    return _cached(font, ("width", text), lambda: font.getbbox(text)[2])
+
+
+def advance(text, font):
+    return _cached(font, ("advance", text), lambda: font.getlength(text))
+
+
+def truncate(text, font, max_width, ellipsis="..."):
+    if text_width(text, font) <= max_width:
+        return text
+
+    return _cached(
+        font,
+        ("truncate", text, max_width, ellipsis),
+        lambda: _truncate(text, font, max_width, ellipsis),
+    )
+
+
+def _truncate(text, font, max_width, ellipsis):
+    # Longest prefix that still fits together with the ellipsis
+    low, high = 0, len(text) - 1
+    if text_width(ellipsis, font) > max_width:
+        return ""
+
+    while low < high:
+        middle = (low + high + 1) // 2
+        if text_width(text[:middle] + ellipsis, font) <= max_width:
+            low = middle
+        else:
+            high = middle - 1
+
+    return text[:low] + ellipsis
+
+
+def wrap(text, font, max_width):
+    return _cached(
+        font, ("wrap", text, max_width), lambda: _wrap(text, font, max_width)
+    )
+
+
+def _wrap(text, font, max_width):
+    if not hasattr(font, "getlength"):
+        return _wrap_measured(text, font, max_width)
+
+    # Extend the current line by advance widths instead of re-measuring it
+    space = advance(" ", font)
+    lines = []
+    current_line = ""
+    current_advance = 0
+
+    for word in text.split(" "):
+        if not word:
+            continue
+        if not current_line:
+            current_line = word
+            current_advance = advance(word, font)
+            continue
+
+        if current_advance + space + text_width(word, font) <= max_width:
+            current_line = f"{current_line} {word}"
+            current_advance += space + advance(word, font)
+        else:
+            lines.append(current_line)
+            current_line = word
+            current_advance = advance(word, font)
+
+    if current_line:
+        lines.append(current_line)
+
+    return "\n".join(lines)
+
+
+def _wrap_measured(text, font, max_width):
+    lines = []
+    current_line = ""
+
+    for word in text.split(" "):
+        test_line = f"{current_line} {word}".strip()
+        if text_width(test_line, font) <= max_width:
+            current_line = test_line
+        else:
+            if current_line:
+                lines.append(current_line)
+            current_line = word
+
+    if current_line:
+        lines.append(current_line)
+
+    return "\n".join(lines)
+
+
+def cache_info():
+    with _lock:
+        return {
+            "hits": _stats["hits"],
+            "misses": _stats["misses"],
+            "fonts": len(_caches),
+            "maxsize": Default.TEXT_CACHE_SIZE,
+        }
+
+
+def clear_cache():
+    with _lock:
+        _caches.clear()
+        _stats["hits"] = 0
+        _stats["misses"] = 0
@@ -0,0 +1,96 @@
+import math
+import threading
+from collections import OrderedDict
+
+from PIL import Image, ImageDraw
+
+import src.default as Default
+import src.text_layout as TextLayout
+import src.cache_owners as CacheOwners
+
+_sprites = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+_owners = CacheOwners.OwnerTable(_lock, lambda key: _sprites.pop(key, None))
+
+SPRITE_MODES = ("RGB", "RGBA", "L")
+
+
+def get_sprite(text, font, align="left", start=(0, 0)):
+    key = (text, font, align, start)
+    with _lock:
+        sprite = _sprites.get(key)
+        if sprite is not None:
+            _sprites.move_to_end(key)
+            _owners.add(key)
+            _stats["hits"] += 1
+            return sprite
+        _stats["misses"] += 1
+
+    sprite = _render(text, font, align, start)
+
+    with _lock:
+        _sprites[key] = sprite
+        _owners.add(key)
+        while len(_sprites) > Default.SPRITE_CACHE_SIZE:
+            _owners.discard(_sprites.popitem(last=False)[0])
+
+    return sprite
+
+
+def _render(text, font, align, start):
+    # Coverage mask of the text; the fill colour is applied when pasting
+    bbox = TextLayout.measure(text, font, align=align)
+    origin = (math.ceil(max(0, -bbox[0])) + 1, math.ceil(max(0, -bbox[1])) + 1)
+    size = (origin[0] + math.ceil(bbox[2]) + 1, origin[1] + math.ceil(bbox[3]) + 1)
+    mask = Image.new("L", size, 0)
+    ImageDraw.Draw(mask).text(
+        (origin[0] + start[0], origin[1] + start[1]),
+        text,
+        fill=255,
+        font=font,
+        align=align,
+    )
+    offset = (-origin[0], -origin[1])
+
+    crop = mask.getbbox()
+    if crop is None:
+        return None, offset
+    return mask.crop(crop), (offset[0] + crop[0], offset[1] + crop[1])
+
+
+def draw_text(image, xy, text, fill, font, align="left"):
+    if image.mode not in SPRITE_MODES or not text or min(xy) < 0:
+        ImageDraw.Draw(image).text(xy, text, fill=fill, font=font, align=align)
+        return
+
+    x = int(xy[0])
+    y = int(xy[1])
+    mask, offset = get_sprite(text, font, align, (xy[0] - x, xy[1] - y))
+    if mask is None:
+        return
+
+    position = (x + offset[0], y + offset[1])
+    image.paste(
+        fill,
+        (position[0], position[1], position[0] + mask.width, position[1] + mask.height),
+        mask,
+    )
+
+
+def cache_info():
+    with _lock:
+        return {
+            "hits": _stats["hits"],
+            "misses": _stats["misses"],
+            "size": len(_sprites),
+            "maxsize": Default.SPRITE_CACHE_SIZE,
+        }
+
+
+def clear_cache():
+    with _lock:
+        _sprites.clear()
+        _owners.clear()
+        _stats["hits"] = 0
+        _stats["misses"] = 0
@@ -0,0 +1,200 @@
+import asyncio
+import unittest
+from datetime import date, datetime, time, timedelta
+from unittest import mock
+
+import aiohttp
+
+import src.api.github as GithubAPI
+import src.api.ical as IcalAPI
+import src.api.toggl as TogglAPI
+from src.panels.toggl_panel import TogglPanel
+
+
+class FakeResponse:
+    def __init__(self, status=200, body=None, content=b""):
+        self.status = status
+        self.body = body
+        self.content = content
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientError(f"HTTP {self.status}")
+
+    async def json(self):
+        return self.body
+
+    async def read(self):
+        return self.content
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = responses
+        self.urls = []
+
+    def _respond(self, url):
+        self.urls.append(url)
+        response = self.responses[url]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def get(self, url, **kwargs):
+        return self._respond(url)
+
+    def post(self, url, **kwargs):
+        return self._respond(url)
+
+
+def ical_event(summary, start):
+    end = start + timedelta(hours=1)
+    return (
+        "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nBEGIN:VEVENT\r\n"
+        f"SUMMARY:{summary}\r\n"
+        f"DTSTART:{start.strftime('%Y%m%dT%H%M%S')}\r\n"
+        f"DTEND:{end.strftime('%Y%m%dT%H%M%S')}\r\n"
+        "END:VEVENT\r\nEND:VCALENDAR\r\n"
+    ).encode()
+
+
+class TestAsyncAPI(unittest.TestCase):
+
+    def test_github_contributions(self):
+        body = {
+            "data": {
+                "user": {
+                    "contributionsCollection": {
+                        "contributionCalendar": {
+                            "weeks": [
+                                {
+                                    "contributionDays": [
+                                        {"color": "#ebedf0", "date": "2024-01-01"}
+                                    ]
+                                }
+                            ]
+                        }
+                    }
+                }
+            }
+        }
+        session = FakeSession({"https://api.github.com/graphql": FakeResponse(body=body)})
+        contributions = asyncio.run(
+            GithubAPI.get_github_contributions_async(session, "user", "token")
+        )
+        self.assertEqual(
+            contributions,
+            [{"contributionDays": [{"color": "#ebedf0", "data": "2024-01-01"}]}],
+        )
+
+    def test_github_error_returns_none(self):
+        session = FakeSession({"https://api.github.com/graphql": FakeResponse(status=401)})
+        self.assertIsNone(
+            asyncio.run(GithubAPI.get_github_contributions_async(session, "user", "token"))
+        )
+
+    def test_ical_merges_and_skips_failures(self):
+        # Noon keeps both events within one day whatever time the test runs
+        tomorrow = datetime.combine(date.today() + timedelta(days=1), time(12))
+        session = FakeSession(
+            {
+                "a": FakeResponse(content=ical_event("First", tomorrow)),
+                "b": aiohttp.ClientConnectionError("refused"),
+                "c": FakeResponse(content=ical_event("Second", tomorrow + timedelta(hours=2))),
+            }
+        )
+        events = asyncio.run(IcalAPI.get_events_async(session, ["a", "b", "c"]))
+        self.assertEqual(session.urls, ["a", "b", "c"])
+        self.assertEqual([event["summary"] for event in events], ["First", "Second"])
+
+    def test_toggl(self):
+        session = FakeSession(
+            {
+                "https://api.track.toggl.com/api/v9/me": FakeResponse(
+                    body={"default_workspace_id": 1}
+                ),
+                "https://api.track.toggl.com/api/v9/workspaces/1/projects": FakeResponse(
+                    body=[{"id": 2, "name": "Project"}]
+                ),
+            }
+        )
+        self.assertEqual(asyncio.run(TogglAPI.verify_api_key_async(session, "key")), 1)
+        projects = asyncio.run(TogglAPI.get_workspace_projects_async(session, "key", 1))
+        self.assertEqual(projects, {2: {"id": 2, "name": "Project"}})
+
+
+class TestTogglPanel(unittest.TestCase):
+
+    def setUp(self):
+        # Constructing and drawing must never reach the blocking API
+        for name in ("verify_api_key", "get_time_entries", "get_workspace_projects"):
+            patcher = mock.patch.object(TogglAPI, name, side_effect=AssertionError(name))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.panel = TogglPanel(200, 100, {"api_key": "key"})
+        self.panel.fetch_async = True
+
+    def test_fetch_verifies_key_and_loads_projects(self):
+        self.panel.draw()
+        self.assertFalse(self.panel.api_key_verified)
+
+        session = FakeSession(
+            {
+                "https://api.track.toggl.com/api/v9/me": FakeResponse(
+                    body={"default_workspace_id": 1}
+                ),
+                "https://api.track.toggl.com/api/v9/me/time_entries": FakeResponse(
+                    body=[
+                        {
+                            "project_id": 3,
+                            "workspace_id": 2,
+                            "description": "Work",
+                            "start": "2024-01-01T09:00:00+00:00",
+                            "duration": 3600,
+                        }
+                    ]
+                ),
+                "https://api.track.toggl.com/api/v9/workspaces/1/projects": FakeResponse(
+                    body=[{"id": 4, "name": "Other"}]
+                ),
+                "https://api.track.toggl.com/api/v9/workspaces/2/projects": FakeResponse(
+                    body=[{"id": 3, "name": "Project", "color": "#ff0000"}]
+                ),
+            }
+        )
+        self.assertTrue(asyncio.run(self.panel.fetch(session)))
+        self.assertEqual(self.panel.api_key_status, 1)
+        self.assertEqual(set(self.panel.projects), {3, 4})
+        self.assertEqual(self.panel._get_project_details(3)["name"], "Project")
+        self.panel.draw()
+
+        session.urls = []
+        self.assertFalse(asyncio.run(self.panel.fetch(session)))
+        self.assertEqual(session.urls, ["https://api.track.toggl.com/api/v9/me/time_entries"])
+
+        # A renamed project redraws although the time entries are the same
+        misses = self.panel.render_misses
+        self.panel._update_projects({3: {"id": 3, "name": "Renamed", "color": "#ff0000"}})
+        self.panel.draw()
+        self.assertEqual(self.panel.render_misses, misses + 1)
+
+    def test_invalid_key_is_verified_once(self):
+        session = FakeSession(
+            {"https://api.track.toggl.com/api/v9/me": FakeResponse(status=403)}
+        )
+        self.assertTrue(asyncio.run(self.panel.fetch(session)))
+        self.assertFalse(asyncio.run(self.panel.fetch(session)))
+        self.assertEqual(len(session.urls), 1)
+        self.assertIsNone(self.panel.api_key_status)
+        self.panel.draw()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,245 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from src.app import Application
+from src.panel import Panel
+from src.panels.layout_panel import LayoutPanel
+from src.panels.text_panel import TextPanel
+from src.panels.time_panel import TimePanel
+
+
+class FetchPanel(Panel):
+    def __init__(self, delay=0, interval=60):
+        super().__init__(100, 100, {})
+        self.delay = delay
+        self.interval = interval
+        self.fetches = 0
+        self.fetched = datetime.min
+        self.cancelled = threading.Event()
+
+    def get_fetch_interval(self):
+        return self.interval
+
+    def get_fetch_deadline(self):
+        return self.fetched + timedelta(seconds=self.interval)
+
+    async def fetch(self, session):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+        self.fetches += 1
+        self.fetched = datetime.now()
+        return True
+
+    def _fingerprint(self):
+        return (self.fetches,)
+
+
+class TestApplication(unittest.TestCase):
+
+    def setUp(self):
+        environ = patch.dict(os.environ, {"EPD_EMULATOR_TIME_SCALE": "0"})
+        environ.start()
+        self.addCleanup(environ.stop)
+        self.directory = tempfile.TemporaryDirectory()
+        panels_file = os.path.join(self.directory.name, "panels.json")
+        self.panels_file = panels_file
+        settings_file = os.path.join(self.directory.name, "setting.json")
+        with open(panels_file, "w") as file:
+            json.dump([{"type": "text", "settings": {"text": "Hello"}}], file)
+        with open(settings_file, "w") as file:
+            json.dump(
+                {
+                    "panel_spec": panels_file,
+                    "epd": "emulator",
+                    "epd_idle_timeout": 0,
+                    "schedule": [{"id": 0, "duration": 60}],
+                },
+                file,
+            )
+        self.app = Application(settings_file)
+        self.thread = threading.Thread(target=self.app.run)
+
+    def tearDown(self):
+        self.app.stop()
+        if self.thread.is_alive():
+            self.thread.join(5)
+        self.directory.cleanup()
+
+    def _wait_for(self, condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _displayed(self):
+        return self.app.display_worker.get_metrics()["displayed"]
+
+    def test_stop_cancels_loop(self):
+        self.thread.start()
+        self.assertTrue(self._wait_for(lambda: self._displayed() >= 1))
+
+        self.app.stop()
+        self.thread.join(5)
+        self.assertFalse(self.thread.is_alive())
+        # The cleanup clears the panel after the displayed frame
+        self.assertEqual(
+            self.app.epd_manager.epd.get_stats()["display"], self._displayed() + 1
+        )
+
+    @patch("src.default.REQUEST_GRACE", 0.05)
+    def test_slow_fetch_does_not_block_rendering(self):
+        slow = FetchPanel(delay=30)
+        self.app.settings.panels[0]["refresh"] = True
+        self.app.panels[0] = LayoutPanel(
+            800, 480, {}, panels=[TextPanel(settings={"text": "Clock"}), slow]
+        )
+        self.thread.start()
+        self.assertTrue(self._wait_for(lambda: self._displayed() >= 1, timeout=2))
+
+        self.app.stop()
+        self.thread.join(5)
+        self.assertTrue(slow.cancelled.is_set())
+        self.assertEqual(slow.fetches, 0)
+
+    def test_fetch_wakes_loop(self):
+        panel = FetchPanel(interval=0.05)
+        self.app.settings.panels[0]["refresh"] = True
+        self.app.panels[0] = panel
+        self.thread.start()
+        self.assertTrue(self._wait_for(lambda: panel.fetches >= 3))
+        self.assertTrue(self._wait_for(lambda: panel.render_misses >= 3))
+        self.assertTrue(panel.fetch_async)
+
+    def test_panel_without_refresh_is_drawn_once(self):
+        panel = LayoutPanel(
+            800, 480, {}, panels=[TimePanel(), FetchPanel(delay=0.1, interval=0.05)]
+        )
+        self.app.panels[0] = panel
+        self.thread.start()
+        self.assertTrue(self._wait_for(lambda: self._displayed() >= 1))
+        time.sleep(0.3)
+        self.assertEqual(panel.panels[1].fetches, 1)
+        self.assertEqual(panel.render_hits + panel.render_misses, 1)
+        self.assertEqual(self._displayed(), 1)
+
+    def test_panel_spec_hot_reload(self):
+        self.thread.start()
+        self.assertTrue(self._wait_for(lambda: self._displayed() >= 1))
+
+        with open(self.panels_file, "w") as file:
+            json.dump([{"type": "text", "settings": {"text": "World"}}], file)
+        self.assertTrue(
+            self._wait_for(lambda: self.app.panels.get(0) and self.app.panels[0].text == "World")
+        )
+        self.assertTrue(self._wait_for(lambda: self._displayed() >= 2))
+        self.assertEqual(self.app.panels[0].width, 800)
+
+    def test_reload_keeps_unchanged_panels(self):
+        unchanged = TextPanel(settings={"text": "Hello"})
+        unchanged.spec = self.app.settings.panels[0]
+        self.app.panels[0] = unchanged
+
+        with open(self.panels_file, "w") as file:
+            json.dump(
+                [
+                    {"type": "time", "settings": {}},
+                    {"type": "text", "settings": {"text": "Hello"}},
+                ],
+                file,
+            )
+        self.assertTrue(self.app.settings.reload())
+        self.app._rebuild_panels()
+        self.assertEqual(self.app.panels.items(), [(1, unchanged)])
+
+    def test_next_panel_is_prewarmed(self):
+        settings = self.app.settings
+        settings.settings["prewarm"] = 7200
+        settings.panels.append({"type": "text", "settings": {"text": "Next"}})
+        settings.schedule = [{"id": 0, "duration": 60}, {"id": 1, "duration": 60}]
+        settings.schedule_length = 2
+        upcoming = FetchPanel()
+        self.app.panels[1] = upcoming
+
+        self.thread.start()
+        self.assertTrue(self._wait_for(lambda: upcoming.render_misses >= 1))
+        self.assertTrue(self._wait_for(lambda: self._displayed() >= 1))
+        self.assertEqual(upcoming.fetches, 1)
+        self.assertTrue(upcoming.active)
+        self.assertEqual(self._displayed(), 1)
+        self.assertEqual(self.app.display_worker.get_metrics()["submitted"], 1)
+
+    def test_prewarmed_panel_is_built_off_render_thread(self):
+        settings = self.app.settings
+        settings.settings["prewarm"] = 7200
+        settings.panels.append({"type": "text", "settings": {"text": "Next"}})
+        settings.schedule = [{"id": 0, "duration": 60}, {"id": 1, "duration": 60}]
+        settings.schedule_length = 2
+
+        threads = {}
+
+        def load_panel(panel_spec, DEBUG=False):
+            threads[panel_spec["settings"]["text"]] = threading.current_thread().name
+            return TextPanel(settings=panel_spec["settings"])
+
+        with patch("src.app.load_panel", load_panel):
+            self.thread.start()
+            self.assertTrue(
+                self._wait_for(lambda: 1 in self.app.panels and self.app.panels[1].active)
+            )
+        self.assertTrue(threads["Hello"].startswith("render"))
+        self.assertTrue(threads["Next"].startswith("build"))
+
+    def test_static_panel_sleeps_until_rotation(self):
+        panel = TextPanel(settings={"text": "Static"})
+        self.app.panels[0] = panel
+        self.thread.start()
+        self.assertTrue(self._wait_for(lambda: self._displayed() >= 1))
+        time.sleep(0.2)
+        self.assertEqual(panel.render_hits + panel.render_misses, 1)
+
+    def test_next_deadline(self):
+        rotation = datetime.now() + timedelta(hours=1)
+        deadline = self.app._next_deadline(TimePanel(), rotation)
+        self.assertEqual((deadline.second, deadline.microsecond), (0, 0))
+        self.assertLessEqual(deadline - datetime.now(), timedelta(minutes=1))
+
+        self.assertEqual(self.app._next_deadline(TextPanel(), rotation), rotation)
+
+    def test_refresh_panel_does_not_poll(self):
+        # Without a panel deadline or a fetch, nothing wakes a refresh panel
+        self.app.settings.settings["refresh"] = 0.05
+        self.app.settings.panels[0]["refresh"] = True
+        panel = TextPanel(settings={"text": "Static"})
+        self.app.panels[0] = panel
+        self.thread.start()
+        self.assertTrue(self._wait_for(lambda: self._displayed() >= 1))
+        time.sleep(0.3)
+        self.assertEqual(panel.render_hits + panel.render_misses, 1)
+
+    def test_bedtime_deadline(self):
+        self.app.settings.bedtime = {"start": "22:00", "end": "06:00"}
+        settings = self.app.settings
+        self.assertEqual(
+            settings.get_bedtime_deadline(datetime(2024, 1, 1, 21, 0)),
+            datetime(2024, 1, 1, 22, 0),
+        )
+        self.assertEqual(
+            settings.get_bedtime_deadline(datetime(2024, 1, 1, 22, 0)),
+            datetime(2024, 1, 2, 6, 0),
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
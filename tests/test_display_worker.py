@@ -0,0 +1,74 @@
+import threading
+import unittest
+
+from src.display.display_worker import DisplayWorker
+
+
+class BlockingManager:
+    def __init__(self):
+        self.frames = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def set_panel(self, image, full_refresh=True):
+        self.started.set()
+        self.release.wait(1)
+        self.frames.append((image, full_refresh))
+
+
+class TestDisplayWorker(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = BlockingManager()
+        self.worker = DisplayWorker(self.manager)
+        self.worker.start()
+
+    def tearDown(self):
+        self.manager.release.set()
+        self.worker.stop()
+
+    def test_only_latest_frame_is_displayed(self):
+        self.worker.submit("first", full_refresh=False)
+        self.manager.started.wait(1)
+
+        # Display is busy, these replace each other in the pending slot
+        self.worker.submit("second", full_refresh=True)
+        self.worker.submit("third", full_refresh=False)
+        self.manager.release.set()
+        self.assertTrue(self.worker.wait_idle(1))
+
+        self.assertEqual(self.manager.frames, [("first", False), ("third", True)])
+        self.assertEqual(
+            self.worker.get_metrics(),
+            {"submitted": 3, "dropped": 1, "displayed": 2, "errors": 0},
+        )
+
+    def test_stop_without_drain_cancels_pending(self):
+        self.worker.submit("first")
+        self.manager.started.wait(1)
+        self.worker.submit("second")
+        self.manager.release.set()
+        self.worker.stop(drain=False)
+
+        self.assertEqual([frame for frame, _ in self.manager.frames], ["first"])
+        self.assertIsNone(self.worker.thread)
+
+    def test_stop_with_drain_displays_pending(self):
+        self.worker.submit("first")
+        self.manager.started.wait(1)
+        self.worker.submit("second")
+        self.manager.release.set()
+        self.worker.stop(drain=True)
+
+        self.assertEqual([frame for frame, _ in self.manager.frames], ["first", "second"])
+
+    def test_errors_do_not_stop_the_worker(self):
+        self.manager.set_panel = lambda image, full_refresh: 1 / 0
+        self.worker.submit("first")
+        self.assertTrue(self.worker.wait_idle(1))
+        self.assertEqual(self.worker.get_metrics()["errors"], 1)
+        self.assertTrue(self.worker.thread.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+from PIL import Image, ImageDraw
+
+from src.display import drivers
+from src.palette import PALETTE
+from src.display.epd_manager import EPDManager
+
+
+class TestDriverRegistry(unittest.TestCase):
+
+    def test_known_drivers(self):
+        self.assertTrue(
+            {"epd7in3e", "mock", "emulator", "emulator_mono", "emulator_gray"}
+            <= set(drivers.list_drivers())
+        )
+        self.assertEqual(drivers.get_driver("epd7in3e")["bits"], 4)
+
+    def test_unknown_driver(self):
+        with self.assertRaises(ValueError):
+            drivers.get_driver("epd99in9")
+
+    @patch.dict(sys.modules)
+    def test_only_selected_driver_is_imported(self):
+        # Other tests may have imported it already, sys.modules is restored after
+        sys.modules.pop("waveshare_epd.epd7in3e", None)
+        epd = drivers.load_driver("emulator_mono")
+        self.assertEqual((epd.bits, len(epd.palette)), (1, 6))
+        self.assertNotIn("waveshare_epd.epd7in3e", sys.modules)
+
+
+@patch.dict(os.environ, {"EPD_EMULATOR_TIME_SCALE": "0"})
+class TestMonochromeDriver(unittest.TestCase):
+
+    def test_mono_pipeline(self):
+        manager = EPDManager("emulator_mono", idle_timeout=0)
+        image = Image.new("RGB", (800, 480), "white")
+        ImageDraw.Draw(image).rectangle((0, 0, 399, 479), fill="black")
+
+        manager.set_panel(image)
+        self.assertEqual(manager.epd.get_stats()["bytes"], 48000)
+        self.assertEqual(manager.epd.get_frame().convert("RGB").tobytes(), image.tobytes())
+
+    def test_mono_fast_refresh(self):
+        self.assertTrue(drivers.get_driver("emulator_mono")["fast_refresh"])
+        manager = EPDManager("emulator_mono", idle_timeout=0)
+        image = Image.new("RGB", (800, 480), "white")
+        manager.set_panel(image)
+        ImageDraw.Draw(image).rectangle((0, 0, 99, 99), fill="black")
+        manager.set_panel(image, full_refresh=False)
+
+        self.assertEqual((manager.get_metrics()["full"], manager.get_metrics()["fast"]), (1, 1))
+        self.assertEqual(manager.epd.get_stats()["fast"], 1)
+        self.assertEqual(manager.epd.get_frame().convert("RGB").tobytes(), image.tobytes())
+
+    def test_gray_pipeline(self):
+        manager = EPDManager("emulator_gray", idle_timeout=0)
+        image = Image.new("RGB", (800, 480), "white")
+        draw = ImageDraw.Draw(image)
+        for index, level in enumerate((0, 85, 170)):
+            draw.rectangle((index * 200, 0, index * 200 + 199, 479), fill=(level,) * 3)
+
+        manager.set_panel(image)
+        # Every level of the rendering palette maps to a controller level
+        self.assertEqual(manager.epd.palette, tuple(PALETTE["gray"][: len(manager.epd.palette)]))
+        self.assertEqual(manager.epd.get_frame().convert("RGB").tobytes(), image.tobytes())
+
+    def test_gray_clear(self):
+        manager = EPDManager("emulator_gray", idle_timeout=0)
+        manager.cleanup()
+        frame = manager.epd.get_frame().convert("L")
+        self.assertEqual(frame.getextrema(), (255, 255))
+
+
+if __name__ == '__main__':
+    unittest.main()
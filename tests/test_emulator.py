@@ -0,0 +1,58 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from PIL import Image
+
+from lib.waveshare_epd import emulator
+from src.display.epd_manager import EPDManager
+
+
+class TestEmulator(unittest.TestCase):
+
+    def setUp(self):
+        self.epd = emulator.EPD(time_scale=0, ring_size=2)
+        self.image = Image.new("RGB", (800, 480), "white")
+        self.image.paste((255, 0, 0), (0, 0, 400, 480))
+
+    def test_decoded_frame_matches_input(self):
+        self.epd.display(self.epd.getbuffer(self.image))
+        self.assertEqual(self.epd.get_frame().convert("RGB").tobytes(), self.image.tobytes())
+
+    def test_timing_model(self):
+        self.epd.init()
+        self.epd.display(self.epd.getbuffer(self.image))
+        stats = self.epd.get_stats()
+        self.assertEqual(stats["bytes"], 192000)
+        self.assertAlmostEqual(stats["spi_seconds"], 0.384)
+        self.assertAlmostEqual(stats["busy_seconds"], emulator.INIT_TIME + emulator.REFRESH_TIME)
+
+    def test_time_scale_blocks(self):
+        epd = emulator.EPD(time_scale=0.001)
+        start = time.monotonic()
+        epd.Clear()
+        self.assertGreaterEqual(time.monotonic() - start, emulator.REFRESH_TIME * 0.001)
+
+    def test_frame_ring_and_background_save(self):
+        for _ in range(3):
+            self.epd.Clear()
+        self.assertEqual(len(self.epd.frames), 2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            paths = self.epd.save_frames(directory, count=1).result(5)
+            self.assertEqual(len(paths), 1)
+            self.assertTrue(os.path.exists(paths[0]))
+
+    @patch.dict(os.environ, {"EPD_EMULATOR_TIME_SCALE": "0"})
+    def test_manager_pipeline(self):
+        manager = EPDManager("emulator", idle_timeout=0)
+        manager.set_panel(self.image)
+        manager.set_panel(self.image)
+        self.assertEqual(manager.get_metrics()["skipped"], 1)
+        self.assertEqual(manager.epd.get_stats()["display"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
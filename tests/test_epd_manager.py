@@ -0,0 +1,149 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from PIL import Image, ImageDraw
+
+from src.display import framebuffer
+from src.display.epd_manager import EPDManager, POWER_AWAKE, POWER_SLEEP
+
+
+def packed(image):
+    return image.tobytes("raw", "P;4")
+
+
+class TestFrameBufferDiff(unittest.TestCase):
+
+    def setUp(self):
+        self.image = Image.new("P", (64, 64), 1)
+
+    def test_identical_buffers(self):
+        self.assertEqual(framebuffer.diff_buffers(packed(self.image), packed(self.image), 64), [])
+
+    def test_changed_area_is_byte_aligned(self):
+        changed = self.image.copy()
+        changed.paste(0, (5, 20, 9, 30))
+        rects = framebuffer.diff_buffers(packed(self.image), packed(changed), 64)
+        self.assertEqual(rects, [(4, 20, 10, 30)])
+
+    def test_separate_areas(self):
+        changed = self.image.copy()
+        changed.paste(0, (0, 0, 4, 4))
+        changed.paste(0, (40, 50, 44, 54))
+        rects = framebuffer.diff_buffers(packed(self.image), packed(changed), 64)
+        self.assertEqual(rects, [(0, 0, 4, 4), (40, 50, 44, 54)])
+
+    def test_crop_buffer(self):
+        changed = self.image.copy()
+        changed.paste(0, (4, 4, 8, 6))
+        window = framebuffer.crop_buffer(packed(changed), 64, (4, 4, 8, 6))
+        self.assertEqual(window, bytes(4))
+
+
+class TestEPDManagerPartialRefresh(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+        self.manager = EPDManager("mock")
+        self.image = Image.new("RGB", (800, 480), "white")
+
+    def tearDown(self):
+        self.manager.cleanup()
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+
+    def test_small_change_uses_windows(self):
+        self.manager.set_panel(self.image)
+        ImageDraw.Draw(self.image).rectangle((100, 100, 140, 120), fill="black")
+
+        with patch.object(self.manager.epd, "display") as display:
+            self.manager.set_panel(self.image, full_refresh=False)
+        display.assert_not_called()
+        self.assertEqual(self.manager.epd.frame.convert("RGB").tobytes(), self.image.tobytes())
+
+    def test_unchanged_frame_is_skipped(self):
+        self.manager.set_panel(self.image)
+        with patch.object(self.manager.epd, "init") as init:
+            self.manager.set_panel(self.image, full_refresh=False)
+        init.assert_not_called()
+
+    def test_identical_frame_skips_full_refresh(self):
+        self.manager.set_panel(self.image)
+        with patch.object(self.manager.epd, "init") as init:
+            self.manager.set_panel(self.image.copy(), full_refresh=True)
+        init.assert_not_called()
+        self.assertEqual(
+            self.manager.get_metrics(),
+            {"frames": 2, "skipped": 1, "full": 1, "partial": 0, "fast": 0, "wakes": 1, "timeouts": 0},
+        )
+
+    def test_large_change_falls_back_to_full_refresh(self):
+        self.manager.set_panel(self.image)
+        with patch.object(self.manager.epd, "display_windows") as display_windows:
+            self.manager.set_panel(Image.new("RGB", (800, 480), "black"), full_refresh=False)
+        display_windows.assert_not_called()
+
+
+class TestEPDManagerPowerState(unittest.TestCase):
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.directory = tempfile.TemporaryDirectory()
+        os.chdir(self.directory.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+
+    def frames(self):
+        return [Image.new("RGB", (800, 480), color) for color in ("white", "black")]
+
+    def test_stays_awake_between_updates(self):
+        manager = EPDManager("mock", idle_timeout=60)
+        with patch.object(manager.epd, "init") as init, patch.object(manager.epd, "sleep") as sleep:
+            for frame in self.frames():
+                manager.set_panel(frame)
+            self.assertEqual(init.call_count, 1)
+            sleep.assert_not_called()
+            self.assertEqual(manager.power_state, POWER_AWAKE)
+
+            manager.cleanup()
+            self.assertEqual(init.call_count, 1)
+            sleep.assert_called_once()
+        self.assertEqual(manager.power_state, POWER_SLEEP)
+
+    def test_zero_idle_timeout_sleeps_after_each_update(self):
+        manager = EPDManager("mock", idle_timeout=0)
+        with patch.object(manager.epd, "init") as init:
+            for frame in self.frames():
+                manager.set_panel(frame)
+        self.assertEqual(init.call_count, 2)
+        self.assertEqual(manager.power_state, POWER_SLEEP)
+
+    def test_busy_timeout_is_recovered(self):
+        manager = EPDManager("mock", idle_timeout=60)
+        with patch.object(manager.epd, "display", side_effect=TimeoutError("BUSY")):
+            manager.set_panel(self.frames()[0])
+        self.assertEqual(manager.power_state, POWER_SLEEP)
+        self.assertEqual(manager.get_metrics()["timeouts"], 1)
+
+        # The same frame is sent again after a fresh init
+        with patch.object(manager.epd, "init") as init:
+            manager.set_panel(self.frames()[0])
+        init.assert_called_once()
+        self.assertEqual(manager.get_metrics()["full"], 1)
+        manager.cleanup()
+
+    def test_idle_timer_puts_display_to_sleep(self):
+        manager = EPDManager("mock", idle_timeout=0.01)
+        manager.set_panel(self.frames()[0])
+        timer = manager.idle_timer
+        timer.join(1)
+        self.assertEqual(manager.power_state, POWER_SLEEP)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import importlib.util
+import os
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from lib.waveshare_epd import epd7in3e, epdconfig, packing
+
+
+class TestSPITransfer(unittest.TestCase):
+
+    def setUp(self):
+        self.buffer = packing.fill_4bpp(800, 480, 0x11)
+        self.spi = epdconfig.MockSPI()
+
+    def test_chunks_share_the_buffer(self):
+        chunks = list(epdconfig.spi_chunks(self.buffer, 4096))
+        self.assertEqual(len(chunks), 47)
+        self.assertTrue(all(chunk.obj is self.buffer for chunk in chunks))
+        self.assertEqual(sum(len(chunk) for chunk in chunks), len(self.buffer))
+
+    def test_chunks_accept_lists(self):
+        chunks = list(epdconfig.spi_chunks([1, 2, 3], 2))
+        self.assertEqual([bytes(chunk) for chunk in chunks], [b"\x01\x02", b"\x03"])
+
+    def test_spidev_transfer_is_chunked(self):
+        device = SimpleNamespace(SPI=self.spi, chunk_size=4096)
+        epdconfig.RaspberryPi.spi_writebuffer(device, self.buffer)
+        self.assertEqual((self.spi.calls, self.spi.bytes), (47, len(self.buffer)))
+        self.assertGreater(self.spi.throughput(), 0)
+
+    def test_software_spi_transfer(self):
+        device = SimpleNamespace(SPI=self.spi, chunk_size=4096)
+        epdconfig.JetsonNano.spi_writebuffer(device, b"\x01\x02\x03")
+        self.assertEqual((self.spi.calls, self.spi.bytes), (3, 3))
+
+
+class TestBusyWait(unittest.TestCase):
+
+    def setUp(self):
+        self.device = SimpleNamespace(GPIO=epdconfig.MockGPIO(), BUSY_PIN=24)
+
+    def test_edge_wait_returns_when_busy_releases(self):
+        self.device.GPIO.set_busy(0.05)
+        start = time.monotonic()
+        epdconfig.JetsonNano.wait_busy(self.device, 1, 1)
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+    def test_edge_wait_times_out(self):
+        self.device.GPIO.set_busy(10)
+        with self.assertRaises(epdconfig.EPDBusyTimeout):
+            epdconfig.JetsonNano.wait_busy(self.device, 1, 0.05)
+
+    def test_polling_backs_off(self):
+        release = time.monotonic() + 0.1
+        reads = []
+
+        def read():
+            reads.append(None)
+            return 1 if time.monotonic() >= release else 0
+
+        epdconfig.poll_level(read, 1, 1)
+        # Fixed 5 ms polling would take around 20 reads
+        self.assertLess(len(reads), 12)
+
+    def test_polling_times_out(self):
+        with self.assertRaises(TimeoutError):
+            epdconfig.poll_level(lambda: 0, 1, 0.02)
+
+    def test_driver_raises_when_busy_sticks(self):
+        epdconfig.set_backend("simulated")
+        gpio = getattr(epdconfig.implementation, "GPIO", None)
+        if not isinstance(gpio, epdconfig.MockGPIO):
+            self.skipTest("requires the simulated GPIO backend")
+        epd = epd7in3e.EPD()
+        epd.busy_timeout = 0.05
+        gpio.set_busy(10)
+        try:
+            with self.assertRaises(epdconfig.EPDBusyTimeout):
+                epd.init()
+        finally:
+            gpio.set_busy(0)
+
+
+class TestLazyBackend(unittest.TestCase):
+
+    def setUp(self):
+        # A private copy of the module so detection starts from scratch
+        spec = importlib.util.spec_from_file_location("epdconfig_fresh", epdconfig.__file__)
+        self.epdconfig = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(self.epdconfig)
+
+    def test_import_does_not_probe(self):
+        self.assertIsNone(self.epdconfig._implementation)
+        self.assertNotIn("digital_read", vars(self.epdconfig))
+
+    def test_backend_override(self):
+        self.epdconfig.set_backend("simulated")
+        self.assertEqual(self.epdconfig.digital_read(24), 1)
+        self.assertIsInstance(self.epdconfig.implementation, self.epdconfig.Simulated)
+        self.assertIn("digital_read", vars(self.epdconfig))
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            self.epdconfig.set_backend("arduino")
+
+    def test_environment_override(self):
+        with patch.dict(os.environ, {"EPD_BACKEND": "sunrise"}):
+            self.assertEqual(self.epdconfig.detect_backend(), "sunrise")
+
+    def test_cpuinfo_detection(self):
+        with tempfile.NamedTemporaryFile("w", delete=False) as f:
+            f.write("Model\t\t: Raspberry Pi 4 Model B Rev 1.4\n")
+        self.addCleanup(os.remove, f.name)
+        self.epdconfig.CPUINFO_PATH = f.name
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(self.epdconfig.detect_backend(), "raspberrypi")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from src import file_watcher
+from src.file_watcher import FileWatcher
+
+
+class TestFileWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "setting.json")
+        with open(self.path, "w") as file:
+            file.write("{}")
+        self.calls = []
+        self.called = threading.Event()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _callback(self):
+        self.calls.append(time.monotonic())
+        self.called.set()
+
+    def _watch(self, backend):
+        watcher = FileWatcher(
+            [self.path], self._callback, backend, debounce=0.1, interval=0.01
+        )
+        watcher.start()
+        self.addCleanup(watcher.stop)
+        return watcher
+
+    def _backends(self):
+        backends = ["poll"]
+        if file_watcher.inotify_available():
+            backends.append("inotify")
+        return backends
+
+    def test_burst_is_debounced(self):
+        for backend in self._backends():
+            with self.subTest(backend=backend):
+                self.calls.clear()
+                self.called.clear()
+                watcher = self._watch(backend)
+                for index in range(5):
+                    with open(self.path, "w") as file:
+                        file.write('{"index": %d, "padding": "%s"}' % (index, "x" * index))
+                    time.sleep(0.02)
+
+                self.assertTrue(self.called.wait(2))
+                time.sleep(0.3)
+                self.assertEqual(len(self.calls), 1)
+                watcher.stop()
+
+    def test_rename_over_file(self):
+        for backend in self._backends():
+            with self.subTest(backend=backend):
+                self.called.clear()
+                self._watch(backend)
+                temporary = os.path.join(self.directory.name, f"{backend}.tmp")
+                with open(temporary, "w") as file:
+                    file.write('{"renamed": "%s"}' % backend)
+                os.replace(temporary, self.path)
+                self.assertTrue(self.called.wait(2))
+
+    def test_unrelated_file_is_ignored(self):
+        for backend in self._backends():
+            with self.subTest(backend=backend):
+                self._watch(backend)
+                with open(os.path.join(self.directory.name, "other.json"), "w") as file:
+                    file.write("{}")
+                self.assertFalse(self.called.wait(0.3))
+
+    def test_parse_events(self):
+        data = file_watcher.EVENT_HEADER.pack(1, 8, 0, 16) + b"setting.json\0\0\0\0"
+        self.assertEqual(list(file_watcher.parse_events(data)), [(1, 8, "setting.json")])
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            FileWatcher([self.path], self._callback, "kqueue")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,7 +7,7 @@ from PIL import Image, ImageFont, ImageDraw
 from pathlib import Path
 
 from src import helper
-from src.palette import PALETTE_6_COLORS
+from src.palette import PALETTE_6_COLORS, PALETTE_GRAY_COLORS, get_palette_image
 
 class TestHelper(unittest.TestCase):
 
@@ -21,6 +21,7 @@ class TestHelper(unittest.TestCase):
         self.test_font_path = "test_font.ttf"
         # This is a placeholder, actual font file creation is complex
         # For now, we'll rely on mocking or a default font for testing.
+        helper.clear_font_cache()
 
     def tearDown(self):
         # Clean up dummy files
@@ -74,6 +75,37 @@ class TestHelper(unittest.TestCase):
         mock_load_default.assert_called_with(size=12)
         self.assertEqual(font, "default_font")
 
+    @patch('src.helper.ImageFont.truetype')
+    def test_load_font_cached(self, mock_truetype):
+        mock_truetype.return_value = "mock_font"
+        helper.load_font(self.test_font_path, 12)
+        font = helper.load_font(self.test_font_path, 12.0)
+        self.assertEqual(font, "mock_font")
+        mock_truetype.assert_called_once_with(self.test_font_path, 12)
+        info = helper.font_cache_info()
+        self.assertEqual((info["hits"], info["misses"], info["size"]), (1, 1, 1))
+
+    @patch('src.helper.ImageFont.truetype', side_effect=Exception("Font error"))
+    @patch('src.helper.ImageFont.load_default')
+    def test_load_font_fallback_cached(self, mock_load_default, mock_truetype):
+        helper.load_font(self.test_font_path, 12)
+        helper.load_font(self.test_font_path, 12)
+        mock_truetype.assert_called_once()
+        mock_load_default.assert_called_once()
+
+    @patch('src.helper.Default.FONT_CACHE_SIZE', 2)
+    @patch('src.helper.ImageFont.truetype')
+    def test_load_font_eviction(self, mock_truetype):
+        mock_truetype.side_effect = lambda path, size: (path, size)
+        helper.load_font(self.test_font_path, 10)
+        helper.load_font(self.test_font_path, 11)
+        helper.load_font(self.test_font_path, 10)
+        helper.load_font(self.test_font_path, 12)
+        self.assertEqual(helper.font_cache_info()["size"], 2)
+        helper.load_font(self.test_font_path, 10)
+        helper.load_font(self.test_font_path, 11)
+        self.assertEqual(mock_truetype.call_count, 4)
+
     def test_position_center(self):
         bbox = (0, 0, 10, 10)
         width = 100
@@ -165,12 +197,22 @@ that needs to be cut"""
         result_image = helper.fit_and_crop_picture(original_image, target_size)
         self.assertEqual(result_image.size, target_size)
 
-    def test_quantize_image(self):
-        # Create a dummy image
-        original_image = Image.new('RGB', (10, 10), color = 'red')
-        quantized_image = helper.quantize_image(original_image, "6_COLORS")
-        self.assertEqual(quantized_image.mode, "P")
-        self.assertIsNotNone(quantized_image.getpalette())
+    def test_quantize_frame(self):
+        image = Image.new('RGB', (20, 10), (128, 128, 128))
+        frame = helper.quantize_frame(image, PALETTE_6_COLORS, [(10, 0, 20, 10)])
+        self.assertEqual(frame.mode, "P")
+        # Flat area maps to a single nearest color, the dithered area mixes colors
+        self.assertEqual(len(set(frame.crop((0, 0, 10, 10)).tobytes())), 1)
+        self.assertGreater(len(set(frame.crop((10, 0, 20, 10)).tobytes())), 1)
+
+    def test_quantize_frame_fully_dithered(self):
+        image = Image.effect_noise((20, 10), 64).convert('RGB')
+        frame = helper.quantize_frame(image, PALETTE_6_COLORS, [(0, 0, 20, 10)])
+        expected = image.quantize(palette=get_palette_image(PALETTE_6_COLORS))
+        self.assertEqual(frame.tobytes(), expected.tobytes())
+
+    def test_palette_image_is_shared(self):
+        self.assertIs(get_palette_image(PALETTE_GRAY_COLORS), get_palette_image(list(PALETTE_GRAY_COLORS)))
 
     @patch('src.helper.Image.new')
     @patch('src.helper.ImageDraw.Draw')
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+from PIL import Image
+
+from lib.waveshare_epd import mock, packing
+
+
+class TestPacking(unittest.TestCase):
+
+    def setUp(self):
+        self.image = Image.frombytes("P", (4, 2), bytes([1, 2, 3, 4, 5, 6, 0, 1]))
+
+    def test_pack_matches_loop(self):
+        self.assertEqual(packing.pack_4bpp(self.image), bytes.fromhex("12345601"))
+        self.assertEqual(
+            packing.pack_4bpp(self.image), bytes(packing.pack_4bpp_loop(self.image))
+        )
+
+    def test_unpack_roundtrip(self):
+        buffer = packing.pack_4bpp(self.image)
+        image = packing.unpack_4bpp(buffer, 4, 2)
+        self.assertEqual(image.tobytes(), self.image.tobytes())
+
+    def test_rejects_rgb(self):
+        with self.assertRaises(ValueError):
+            packing.pack_4bpp(Image.new("RGB", (4, 2)))
+
+    def test_low_bit_depths(self):
+        image = Image.frombytes("P", (8, 1), bytes([0, 1, 2, 3, 3, 2, 1, 0]))
+        self.assertEqual(packing.pack_2bpp(image), bytes.fromhex("1be4"))
+        mono = image.point(lambda value: value & 1)
+        self.assertEqual(packing.pack_1bpp(mono), bytes.fromhex("5a"))
+        self.assertEqual(packing.unpack(bytes.fromhex("1be4"), 8, 1, 2).tobytes(), image.tobytes())
+
+    def test_unsupported_bit_depth(self):
+        with self.assertRaises(ValueError):
+            packing.pack(self.image, 3)
+
+    def test_fill_value(self):
+        self.assertEqual(packing.fill_value(1, 4), 0x11)
+        self.assertEqual(packing.fill_value(3, 2), 0xFF)
+        self.assertEqual(packing.fill_value(1, 1), 0xFF)
+
+    def test_fill(self):
+        buffer = packing.fill_4bpp(800, 480, 0x11)
+        self.assertEqual(len(buffer), 192000)
+        self.assertEqual(set(buffer), {0x11})
+        self.assertIs(buffer, packing.fill_4bpp(800, 480, 0x11))
+
+    def test_mock_driver_roundtrip(self):
+        epd = mock.EPD()
+        buffer = epd.getbuffer(Image.new("RGB", (epd.width, epd.height), "red"))
+        self.assertEqual(set(buffer), {0x33})
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            try:
+                epd.display(buffer)
+                with Image.open("test_image.png") as image:
+                    self.assertEqual(image.convert("RGB").getpixel((0, 0)), (255, 0, 0))
+            finally:
+                os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    unittest.main()
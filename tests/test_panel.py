@@ -0,0 +1,255 @@
+import unittest
+from datetime import datetime
+
+from src.panel import Panel
+from src.panels.text_panel import TextPanel
+from src.panels.time_panel import TimePanel
+from src.panels.four_panel import FourPanel
+from src.panels.layout_panel import LayoutPanel
+from src.panels.loader import load_panel, reload_panel
+
+
+class TestPanelRenderCache(unittest.TestCase):
+
+    def test_draw_returns_cached_frame(self):
+        panel = TextPanel(200, 100, {"text": "Hello"})
+        first = panel.draw()
+        second = panel.draw()
+        self.assertIs(first, second)
+        self.assertEqual(panel.cache_stats(), {"hits": 1, "misses": 1})
+
+    def test_text_change_invalidates_cache(self):
+        panel = TextPanel(200, 100, {"text": "Hello"})
+        first = panel.draw()
+        panel.update_text("World")
+        second = panel.draw()
+        self.assertIsNot(first, second)
+        self.assertEqual(panel.cache_stats(), {"hits": 0, "misses": 2})
+
+    def test_size_change_invalidates_cache(self):
+        panel = TextPanel(200, 100, {"text": "Hello"})
+        panel.draw()
+        panel.set_size(100, 50)
+        image = panel.draw()
+        self.assertEqual(image.size, (100, 50))
+        self.assertEqual(panel.render_misses, 2)
+
+    def test_render_cache_disabled(self):
+        panel = Panel(50, 50, {"render_cache": False})
+        self.assertIsNot(panel.draw(), panel.draw())
+        self.assertEqual(panel.cache_stats(), {"hits": 0, "misses": 2})
+
+    def test_fingerprint_includes_palette(self):
+        panel = Panel(50, 50, {})
+        fingerprint = panel.fingerprint()
+        panel.palette_name = "gray"
+        self.assertNotEqual(fingerprint, panel.fingerprint())
+
+
+class TestCompositeDamage(unittest.TestCase):
+
+    def setUp(self):
+        self.children = [TextPanel(0, 0, {"text": str(i)}) for i in range(4)]
+        self.panel = FourPanel(800, 480, {"padding": 0}, False, *self.children)
+
+    def test_first_frame_damages_everything(self):
+        image = self.panel.draw()
+        self.assertEqual(image.info["damage"], [(0, 0, 800, 480)])
+
+    def test_only_dirty_child_is_redrawn(self):
+        self.panel.draw()
+        self.children[3].update_text("changed")
+        image = self.panel.draw()
+
+        self.assertEqual(image.info["damage"], [(400, 240, 790, 470)])
+        self.assertEqual([c.render_misses for c in self.children], [1, 1, 1, 2])
+
+        fresh = FourPanel(
+            800,
+            480,
+            {"padding": 0},
+            False,
+            *[TextPanel(0, 0, {"text": c.text}) for c in self.children],
+        )
+        self.assertEqual(image.tobytes(), fresh.draw().tobytes())
+
+    def test_thread_executor_matches_sequential(self):
+        children = [TextPanel(0, 0, {"text": str(i)}) for i in range(4)]
+        threaded = FourPanel(
+            800, 480, {"padding": 0, "executor": "thread"}, False, *children
+        )
+        self.assertEqual(threaded.draw().tobytes(), self.panel.draw().tobytes())
+
+    def test_unknown_executor(self):
+        with self.assertRaises(ValueError):
+            FourPanel(800, 480, {"executor": "process"})
+
+    def test_dither_regions_are_collected(self):
+        self.children[1].dither = True
+        image = self.panel.draw()
+        self.assertEqual(image.info["dither"], [(400, 10, 790, 240)])
+
+    def test_unchanged_frame_has_no_damage(self):
+        self.panel.draw()
+        image = self.panel.draw()
+        self.assertEqual(image.info["damage"], [])
+
+
+class TestLayoutPanel(unittest.TestCase):
+
+    def rects(self, panel):
+        return [rect for _, rect in panel.table]
+
+    def test_weighted_columns(self):
+        children = [Panel(0, 0, {}) for _ in range(2)]
+        panel = LayoutPanel(
+            300, 100, {"margin": 0, "padding": 0, "columns": [2, 1]}, panels=children
+        )
+        self.assertEqual(self.rects(panel), [(0, 0, 200, 100), (200, 0, 300, 100)])
+        self.assertEqual((children[0].width, children[0].height), (200, 100))
+
+    def test_spans_and_cell_padding(self):
+        children = [Panel(0, 0, {}) for _ in range(3)]
+        panel = LayoutPanel(
+            200,
+            200,
+            {"margin": 0, "padding": 0, "rows": 2, "columns": 2},
+            panels=children,
+            cells=[{"column_span": 2}, {"padding": 10}, {}],
+        )
+        self.assertEqual(
+            self.rects(panel),
+            [(0, 0, 200, 100), (10, 110, 90, 190), (100, 100, 200, 200)],
+        )
+
+    def test_nested_layout_is_flattened(self):
+        panel = load_panel(
+            {
+                "type": "layout",
+                "width": 400,
+                "height": 200,
+                "settings": {"margin": 0, "padding": 0},
+                "panels": [
+                    {"type": "text", "settings": {"text": "a"}},
+                    {
+                        "type": "layout",
+                        "settings": {"margin": 0, "padding": 0, "rows": 2},
+                        "panels": [
+                            {"type": "text", "settings": {"text": "b"}},
+                            {"type": "text", "settings": {"text": "c"}},
+                        ],
+                    },
+                ],
+            }
+        )
+        self.assertEqual([p.text for p, _ in panel.table], ["a", "b", "c"])
+        self.assertEqual(
+            self.rects(panel),
+            [(0, 0, 200, 200), (200, 0, 400, 100), (200, 100, 400, 200)],
+        )
+
+    def test_table_is_reused_until_size_changes(self):
+        panel = LayoutPanel(200, 100, {}, panels=[Panel(0, 0, {})])
+        table = panel.table
+        panel.draw()
+        self.assertIs(panel.table, table)
+        panel.set_size(100, 100)
+        self.assertIsNot(panel.table, table)
+
+    def test_too_many_panels(self):
+        with self.assertRaises(ValueError):
+            LayoutPanel(
+                200, 100, {"rows": 1, "columns": 1}, panels=[Panel(0, 0, {})] * 2
+            )
+
+
+class TestReloadPanel(unittest.TestCase):
+
+    def spec(self, *texts):
+        return {
+            "type": "four",
+            "width": 400,
+            "height": 200,
+            "settings": {"padding": 0},
+            "panels": [{"type": "text", "settings": {"text": text}} for text in texts],
+        }
+
+    def test_unchanged_spec_is_reused(self):
+        panel = load_panel(self.spec("a", "b"))
+        panel.draw()
+        self.assertIs(reload_panel(panel, self.spec("a", "b")), panel)
+
+    def test_only_changed_child_is_rebuilt(self):
+        panel = load_panel(self.spec("a", "b", "c"))
+        first = panel.panels[0].draw()
+        reloaded = reload_panel(panel, self.spec("a", "x", "c"))
+
+        self.assertIsNot(reloaded, panel)
+        self.assertIs(reloaded.panels[0], panel.panels[0])
+        self.assertIsNot(reloaded.panels[1], panel.panels[1])
+        self.assertIs(reloaded.panels[2], panel.panels[2])
+        self.assertEqual(reloaded.panels[1].text, "x")
+        self.assertIs(reloaded.panels[0].draw(), first)
+
+    def test_moved_child_is_reused(self):
+        panel = load_panel(self.spec("a", "b"))
+        reloaded = reload_panel(panel, self.spec("b", "a"))
+        self.assertEqual(
+            [id(child) for child in reloaded.panels[:2]],
+            [id(panel.panels[1]), id(panel.panels[0])],
+        )
+
+    def test_inserted_child_does_not_steal_match(self):
+        panel = load_panel(self.spec("a", "b"))
+        reloaded = reload_panel(panel, self.spec("x", "a"))
+        self.assertIs(reloaded.panels[1], panel.panels[0])
+        self.assertEqual(reloaded.panels[0].text, "x")
+
+    def test_nested_layout_keeps_grandchildren(self):
+        spec = {"type": "layout", "panels": [self.spec("a", "b"), {"type": "time"}]}
+        panel = load_panel(spec)
+        changed = {"type": "layout", "panels": [self.spec("a", "c"), {"type": "time"}]}
+        reloaded = reload_panel(panel, changed)
+
+        self.assertIs(reloaded.panels[1], panel.panels[1])
+        self.assertIsNot(reloaded.panels[0], panel.panels[0])
+        self.assertIs(reloaded.panels[0].panels[0], panel.panels[0].panels[0])
+
+    def test_replaced_container_is_released(self):
+        spec = self.spec("a", "b")
+        spec["settings"]["executor"] = "thread"
+        panel = load_panel(spec)
+        panel.setup()
+        panel.draw()
+        self.assertIsNotNone(panel.pool)
+
+        changed = self.spec("a", "x")
+        changed["settings"]["executor"] = "thread"
+        reloaded = reload_panel(panel, changed)
+        self.assertIsNone(panel.pool)
+        self.assertTrue(panel.panels[0].active)
+        self.assertFalse(panel.panels[1].active)
+        self.assertIs(reloaded.panels[0], panel.panels[0])
+
+    def test_type_change_rebuilds(self):
+        panel = load_panel({"type": "text", "settings": {"text": "a"}})
+        reloaded = reload_panel(panel, {"type": "time"})
+        self.assertEqual(type(reloaded).__name__, "TimePanel")
+
+
+class TestDeadlines(unittest.TestCase):
+
+    def test_time_panel_minute_boundary(self):
+        now = datetime(2024, 1, 1, 12, 30, 15, 500)
+        self.assertEqual(TimePanel().next_deadline(now), datetime(2024, 1, 1, 12, 31))
+        self.assertIsNone(TextPanel().next_deadline(now))
+
+    def test_composite_earliest_deadline(self):
+        now = datetime(2024, 1, 1, 23, 59, 30)
+        layout = LayoutPanel(panels=[TextPanel(), TimePanel()])
+        self.assertEqual(layout.next_deadline(now), datetime(2024, 1, 2, 0, 0))
+        self.assertIsNone(LayoutPanel(panels=[TextPanel()]).next_deadline(now))
+
+
+if __name__ == '__main__':
+    unittest.main()
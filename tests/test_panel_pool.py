@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+
+from PIL import Image
+
+import src.helper as Helper
+import src.text_sprite as TextSprite
+from src.panel_pool import PanelPool
+from src.panels.loader import load_panel
+from src.panels.picture_panel import PicturePanel
+
+
+class TestPanelPool(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.picture = os.path.join(self.directory.name, "picture.png")
+        Image.new("RGB", (400, 300), "red").save(self.picture)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def spec(self, text):
+        return {"type": "text", "width": 200, "height": 100, "settings": {"text": text}}
+
+    def test_load_reuses_and_sets_up(self):
+        pool = PanelPool()
+        panel = pool.load(0, self.spec("a"), load_panel)
+        self.assertTrue(panel.active)
+        self.assertIs(pool.load(0, self.spec("a"), load_panel), panel)
+        self.assertEqual(pool.get_stats()["loads"], 1)
+
+    def test_picture_panel_suspend_releases_picture(self):
+        panel = PicturePanel(200, 100, {"picture": self.picture})
+        panel.setup()
+        first = panel.draw()
+        self.assertEqual(panel.memory_usage(), 200 * 100 * 3 + 400 * 300 * 3)
+
+        panel.suspend()
+        self.assertIsNone(panel.picture)
+        self.assertEqual(panel.memory_usage(), 0)
+
+        # Drawing decodes the picture again
+        self.assertEqual(panel.draw().tobytes(), first.tobytes())
+
+    def test_trim_suspends_least_recently_used(self):
+        pool = PanelPool(budget=0)
+        for panel_id in range(3):
+            pool.load(panel_id, self.spec(str(panel_id)), load_panel).draw()
+        pool.load(0, self.spec("0"), load_panel)
+
+        self.assertEqual(pool.trim(keep={0, 2}), 200 * 100 * 3 * 2)
+        self.assertEqual([panel.active for _, panel in pool.items()], [False, True, True])
+        self.assertIsNone(pool[1].render_image)
+        self.assertIsNotNone(pool[0].render_image)
+
+    def test_suspend_releases_only_unshared_cache_entries(self):
+        Helper.clear_font_cache()
+        TextSprite.clear_cache()
+        pool = PanelPool(budget=0)
+        for panel_id in range(2):
+            pool.load(panel_id, self.spec(str(panel_id)), load_panel).draw()
+        self.assertEqual(TextSprite.cache_info()["size"], 2)
+        fonts = Helper.font_cache_info()["size"]
+
+        # The font is shared, the sprite of the suspended panel is not
+        pool.trim(keep={1})
+        self.assertEqual(TextSprite.cache_info()["size"], 1)
+        self.assertEqual(Helper.font_cache_info()["size"], fonts)
+
+        pool.trim()
+        self.assertEqual(TextSprite.cache_info()["size"], 0)
+        self.assertEqual(Helper.font_cache_info()["size"], fonts - 1)
+
+    def test_trim_evicts_beyond_size(self):
+        pool = PanelPool(size=2)
+        panels = [pool.load(panel_id, self.spec(str(panel_id)), load_panel) for panel_id in range(4)]
+        pool.trim(keep={0})
+
+        self.assertEqual(sorted(panel_id for panel_id, _ in pool.items()), [0, 3])
+        self.assertFalse(panels[1].active)
+        self.assertEqual(pool.get_stats()["evictions"], 2)
+
+    def test_composite_lifecycle_cascades(self):
+        panel = load_panel(
+            {
+                "type": "horizontal",
+                "width": 400,
+                "height": 200,
+                "panels": [
+                    {"type": "text", "settings": {"text": "a"}},
+                    {"type": "picture", "settings": {"picture": self.picture}},
+                ],
+            }
+        )
+        panel.setup()
+        panel.draw()
+        self.assertTrue(all(inner.active for inner, _ in panel.get_panels()))
+        self.assertGreater(panel.memory_usage(), 400 * 200 * 3)
+
+        panel.suspend()
+        self.assertFalse(any(inner.active for inner, _ in panel.get_panels()))
+        self.assertEqual(panel.memory_usage(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
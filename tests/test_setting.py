@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.setting import Setting
+
+
+class TestSettingReload(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.panels_file = os.path.join(self.directory.name, "panels.json")
+        self.settings_file = os.path.join(self.directory.name, "setting.json")
+        self._write(self.panels_file, [{"type": "text", "settings": {"text": "A"}}])
+        self._write(
+            self.settings_file,
+            {"panel_spec": self.panels_file, "schedule": [{"id": 0}]},
+        )
+        self.settings = Setting(self.settings_file)
+        self.settings.set_epd_settings(SimpleNamespace(width=800, height=480))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _write(self, path, content):
+        with open(path, "w") as file:
+            json.dump(content, file)
+
+    def test_reload_applies_new_panels(self):
+        self._write(
+            self.panels_file,
+            [{"type": "text", "settings": {"text": "B"}}, {"type": "time", "settings": {}}],
+        )
+        self.assertTrue(self.settings.reload())
+        self.assertEqual(len(self.settings.panels), 2)
+        self.assertEqual(self.settings.panels[1]["width"], 800)
+        self.assertEqual(self.settings.panels[1]["settings"]["palette"], "6_colors")
+
+    def test_partial_write_keeps_last_good(self):
+        with open(self.panels_file, "w") as file:
+            file.write('[{"type": "te')
+        self.assertFalse(self.settings.reload())
+        self.assertEqual(self.settings.panels[0]["settings"]["text"], "A")
+
+    def test_invalid_schedule_keeps_last_good(self):
+        self._write(
+            self.settings_file,
+            {"panel_spec": self.panels_file, "schedule": [{"id": 3}]},
+        )
+        self.assertFalse(self.settings.reload())
+        self.assertEqual(self.settings.schedule, [{"id": 0}])
+        self.assertEqual(self.settings.get_next_panel()[0], 0)
+
+    def test_reload_swaps_state_at_once(self):
+        self._write(
+            self.settings_file,
+            {"panel_spec": self.panels_file, "schedule": [{"id": 0}, {"id": 0}]},
+        )
+        seen = []
+        load_panels = Setting._load_panels
+
+        def record(staged):
+            # The live settings are untouched while the files are parsed
+            seen.append((self.settings.schedule_length, self.settings.panels[0]["width"]))
+            load_panels(staged)
+
+        with patch.object(Setting, "_load_panels", record):
+            self.assertTrue(self.settings.reload())
+        self.assertEqual(seen, [(1, 800)])
+        self.assertEqual(self.settings.schedule_length, 2)
+        self.assertEqual(self.settings.panels[0]["width"], 800)
+
+    def test_peek_next_panel(self):
+        self.settings.panels.append({"type": "time", "settings": {}})
+        self.settings.schedule = [{"id": 1}, {"id": 0}]
+        self.settings.schedule_length = 2
+        self.settings.bedtime = {"start": "22:00", "end": "06:00", "id": 0}
+
+        self.assertEqual(self.settings.peek_next_panel(datetime(2024, 1, 1, 12))[0], 1)
+        self.assertEqual(self.settings.peek_next_panel(datetime(2024, 1, 1, 23))[0], 0)
+        self.assertEqual(self.settings.current_panel_index, 0)
+
+    def test_watching_skips_polling(self):
+        self.settings.watching = True
+        self._write(self.panels_file, [{"type": "text", "settings": {"text": "B"}}])
+        self.settings.get_next_panel()
+        self.assertEqual(self.settings.panels[0]["settings"]["text"], "A")
+
+
+if __name__ == '__main__':
+    unittest.main()
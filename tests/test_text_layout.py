@@ -0,0 +1,89 @@
+import unittest
+
+from src import helper
+from src import text_layout
+from src import text_sprite
+
+
+class TestTextLayout(unittest.TestCase):
+
+    def setUp(self):
+        text_layout.clear_cache()
+        self.font = helper.load_font(
+            "fonts/roboto_mono/static/RobotoMono-Regular.ttf", 16
+        )
+
+    def test_measure_matches_textbbox(self):
+        from PIL import Image, ImageDraw
+
+        draw = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+        text = "Week 42\n10:00-11:00"
+        self.assertEqual(
+            text_layout.measure(text, self.font),
+            draw.textbbox((0, 0), text, font=self.font),
+        )
+
+    def test_measure_is_memoized(self):
+        text_layout.measure("Hello", self.font)
+        text_layout.measure("Hello", self.font)
+        info = text_layout.cache_info()
+        self.assertEqual((info["hits"], info["misses"]), (1, 1))
+
+    def test_wrap_matches_measured_wrap(self):
+        text = "The quick brown fox jumps over the lazy dog again and again"
+        for max_width in (40, 100, 180, 400):
+            self.assertEqual(
+                text_layout.wrap(text, self.font, max_width),
+                text_layout._wrap_measured(text, self.font, max_width),
+            )
+
+    def test_truncate_fits(self):
+        text = "A very long calendar summary that does not fit"
+        result = text_layout.truncate(text, self.font, 120)
+        self.assertTrue(result.endswith("..."))
+        self.assertLessEqual(self.font.getbbox(result)[2], 120)
+        longer = text[: len(result) - 2] + "..."
+        self.assertGreater(self.font.getbbox(longer)[2], 120)
+
+    def test_truncate_nothing_fits(self):
+        self.assertEqual(text_layout.truncate("Hello", self.font, 1), "")
+
+
+class TestTextSprite(unittest.TestCase):
+
+    def setUp(self):
+        text_sprite.clear_cache()
+        self.font = helper.load_font(
+            "fonts/roboto_mono/static/RobotoMono-Regular.ttf", 20
+        )
+
+    def test_matches_draw_text(self):
+        from PIL import Image, ImageDraw
+
+        for xy, fill, align in [
+            ((10, 10), "black", "left"),
+            ((30.25, 12.5), "#12ab34", "center"),
+            ((5, 40), 0x0000FF, "right"),
+        ]:
+            expected = Image.new("RGB", (200, 120), "white")
+            ImageDraw.Draw(expected).text(
+                xy, "2024-01-01\n12:34", fill=fill, font=self.font, align=align
+            )
+            image = Image.new("RGB", (200, 120), "white")
+            text_sprite.draw_text(
+                image, xy, "2024-01-01\n12:34", fill=fill, font=self.font, align=align
+            )
+            self.assertEqual(image.tobytes(), expected.tobytes())
+
+    def test_sprite_reused_across_colors(self):
+        from PIL import Image
+
+        image = Image.new("RGB", (100, 50), "white")
+        text_sprite.draw_text(image, (5, 5), "Hi", fill="red", font=self.font)
+        text_sprite.draw_text(image, (7, 7), "Hi", fill="black", font=self.font)
+        info = text_sprite.cache_info()
+        self.assertEqual((info["hits"], info["misses"]), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()